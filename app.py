@@ -1,10 +1,27 @@
+import time
+
+# Start of this script run; cold-start timings are measured from here
+SCRIPT_START = time.perf_counter()
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import numpy as np
-from urllib.parse import parse_qs, urlparse
-import requests
-import io
+from streamlit.logger import get_logger
+
+# Streamlit's logger factory attaches a handler and applies the server's `logger.level` setting
+# (INFO by default), so cold-start timings within budget also reach the app logs
+logger = get_logger(__name__)
+
+# pandas, plotly and requests are imported lazily inside the functions that use them;
+# rendering a deep link from the record store needs only plotly (spider chart) and NumPy, not pandas
 
 dim_detail = {
     'Dimensi 1': 'LEADERSHIP & STRATEGI',
@@ -129,74 +146,689 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_data():
-    """Memuat data dari Google Sheets - selalu update real-time"""
+# Target cold-start timings (ms), measured from the first script run in the process
+COLD_START_BUDGET_MS = {
+    'ttfb': 1500,         # first element (header / empty state) sent to the browser
+    'first_chart': 4000   # first spider chart rendered
+}
+
+# Umur cache snapshot data (detik)
+SNAPSHOT_TTL_SECONDS = 300
+
+# Maksimal waktu menunggu warm-up selesai sebelum memuat data sendiri (detik)
+WARM_UP_WAIT_SECONDS = 15
+
+# Interval auto-refresh mode wallboard (detik)
+WALLBOARD_REFRESH_SECONDS = 30
+
+# A deep link that is not in a snapshot older than this re-reads the sheet before reporting not-found
+RECORD_MISS_REFRESH_SECONDS = 15
+
+# Bootstrap selang kepercayaan rata-rata overview: jumlah resample dan tingkat kepercayaan
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_CONFIDENCE = 0.95
+
+# Secret berisi kunci HMAC untuk tautan dashboard per RS (?org=<nama RS/grup>&sig=<tanda tangan>)
+# dan tabel grup RS (nama grup -> daftar nama RS); nilai org khusus untuk tampilan nasional
+SCOPE_SIGNING_SECRET = 'SCOPE_SIGNING_KEY'
+SCOPE_GROUPS_SECRET = 'SCOPE_GROUPS'
+NATIONAL_SCOPE = '*'
+
+# Jumlah versi snapshot yang artefak turunannya disimpan di memori
+ARTIFACT_CACHE_ENTRIES = 4
+
+# Entity resolution nama RS: ambang kemiripan Jaccard trigram dan batas panjang posting list n-gram
+HOSPITAL_MATCH_THRESHOLD = 0.8
+HOSPITAL_MAX_POSTING = 200
+
+# Penulisan jenis RS yang diseragamkan sebelum pencocokan (urutan penting: yang paling panjang dulu)
+HOSPITAL_TYPE_PATTERNS = [
+    (r'\brumah sakit umum daerah\b', 'rsud'),
+    (r'\brumah sakit umum pusat\b', 'rsup'),
+    (r'\brumah sakit ibu (dan|&) anak\b', 'rsia'),
+    (r'\brumah sakit umum\b', 'rsu'),
+    (r'\brumah sakit\b', 'rs'),
+    (r'\br s\b', 'rs')
+]
+HOSPITAL_GENERIC_TOKENS = {'rs'}
+
+# Jenis RS spesifik, nomor dan angka romawi membedakan fasilitas: nama hanya digabung jika token ini sama persis
+HOSPITAL_TYPE_TOKENS = {'rsu', 'rsud', 'rsup', 'rsia'}
+HOSPITAL_ROMAN_NUMERAL = re.compile(r'x{0,3}(ix|iv|v?i{0,3})')
+
+# Nama file di dalam bundle hasil precompute_worker.py
+BUNDLE_CURRENT_FILE = 'CURRENT'
+BUNDLE_MANIFEST_FILE = 'manifest.json'
+BUNDLE_SCORED_FILE = 'scored.arrow'
+BUNDLE_QUARANTINE_FILE = 'quarantine.arrow'
+BUNDLE_SELECTOR_FILE = 'selector.arrow'
+BUNDLE_NEIGHBOURS_FILE = 'neighbours.npy'
+BUNDLE_ROW_HASHES_FILE = 'row_hashes.npy'
+BUNDLE_HOSPITALS_FILE = 'hospitals.arrow'
+BUNDLE_HOSPITAL_ROLLUP_FILE = 'hospital_rollup.arrow'
+
+# Folder cache file export, jumlah baris yang ditulis per chunk dan jumlah file yang disimpan
+EXPORT_DIR = Path(tempfile.gettempdir()) / 'jotform-result-exports'
+EXPORT_CHUNK_ROWS = 10000
+EXPORT_MAX_FILES = 20
+
+@st.cache_resource
+def get_cold_start_metrics():
+    """Timing cold start per proses (ms), diisi sekali oleh mark_cold_start()"""
+    return {}
+
+def mark_cold_start(name):
+    """Mencatat timing cold start pertama untuk `name` dan membandingkannya dengan budget"""
+    metrics = get_cold_start_metrics()
+    if name in metrics:
+        return
+    elapsed_ms = (time.perf_counter() - SCRIPT_START) * 1000
+    metrics[name] = elapsed_ms
+    budget_ms = COLD_START_BUDGET_MS[name]
+    if elapsed_ms <= budget_ms:
+        logger.info("cold start %s=%.0fms (budget %dms)", name, elapsed_ms, budget_ms)
+    else:
+        logger.warning("cold start %s=%.0fms melebihi budget %dms", name, elapsed_ms, budget_ms)
+
+# Kolom sheet yang benar-benar dipakai dashboard (identitas, skor dimensi, ID)
+SHEET_API_COLUMNS = [
+    'Nama Responden:',
+    'Jabatan:',
+    'Nama Rumah Sakit:',
+    'Lokasi RS:',
+    'Jumlah Tempat Tidur:',
+    'Skor Dimensi 1',
+    'Skor Dimensi 2',
+    'Skor Dimensi 3',
+    'Skor Dimensi 4',
+    'Skor Dimensi 5',
+    'Submission ID'
+]
+
+# Kolom opsional yang ikut dibaca jika ada di sheet
+SHEET_API_OPTIONAL_COLUMNS = [
+    'Level AI Maturity'
+]
+
+DIMENSION_COLUMNS = ['Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']
+
+# Model skor (bobot dimensi dan batas level) yang diversikan
+SCORING_MODEL_PATH = Path(__file__).with_name('scoring_model.json')
+
+# Field setiap level di model skor yang ditampilkan pada kartu analisis AI maturity
+LEVEL_DETAIL_FIELDS = ['level', 'name', 'max_percentage', 'description', 'characteristics', 'next_steps', 'color']
+
+def load_scoring_model(path=SCORING_MODEL_PATH):
+    """Memuat dan memvalidasi model skor dari file konfigurasi JSON"""
+    with open(path, encoding='utf-8') as f:
+        model = json.load(f)
+    
+    keys = [dim['key'] for dim in model['dimensions']]
+    if keys != DIMENSION_COLUMNS:
+        raise Exception(f"Dimensi model skor tidak sesuai: {', '.join(keys)}")
+    
+    total_weight = sum(dim['weight'] for dim in model['dimensions'])
+    if abs(total_weight - 1) > 1e-9:
+        raise Exception(f"Total bobot model skor harus 100%, didapat {total_weight * 100:.1f}%")
+    
+    numbers = [level['level'] for level in model['levels']]
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise Exception(f"Level model skor harus bernomor urut mulai dari 1, didapat {numbers}")
+    
+    for level in model['levels']:
+        missing_fields = [field for field in LEVEL_DETAIL_FIELDS if field not in level]
+        if missing_fields:
+            raise Exception(f"Level {level['level']} model skor tidak memiliki: {', '.join(missing_fields)}")
+    
+    thresholds = [level['max_percentage'] for level in model['levels']]
+    if thresholds != sorted(thresholds) or thresholds[-1] != 100:
+        raise Exception("Batas level model skor harus naik dan berakhir di 100%")
+    
+    return model
+
+SCORING_MODEL = load_scoring_model()
+
+# Bobot tiap dimensi pada skor tertimbang
+DIMENSION_WEIGHTS = {dim['key']: dim['weight'] for dim in SCORING_MODEL['dimensions']}
+
+# Batas atas persentase skor tertimbang untuk Level 1-5
+LEVEL_THRESHOLDS = [level['max_percentage'] for level in SCORING_MODEL['levels']]
+
+# Skor maksimal per dimensi
+MAX_DIMENSION_SCORE = SCORING_MODEL['max_dimension_score']
+
+def compile_scoring_model(weights=None):
+    """Mengompilasi model skor menjadi vektor bobot dan array batas level (NumPy)
+    
+    `weights` (dict per dimensi) dapat menggantikan bobot dari konfigurasi, misalnya untuk simulasi what-if.
+    """
+    import numpy as np
+    
+    weights = weights or DIMENSION_WEIGHTS
+    weight_vector = np.array([weights[dim] for dim in DIMENSION_COLUMNS], dtype=np.float64)
+    thresholds = np.array(LEVEL_THRESHOLDS, dtype=np.float64)
+    return weight_vector, thresholds
+
+def score_matrix(scores, weight_vector):
+    """Skor tertimbang untuk semua baris sekaligus dari matriks skor (n x 5)"""
+    return scores @ weight_vector
+
+def bucket_levels(weighted_totals, thresholds):
+    """Level AI maturity (1-5) untuk semua skor tertimbang sekaligus; 0 jika di luar rentang"""
+    import numpy as np
+    
+    # Rounded so a total exactly on a boundary (e.g. 8.25 -> 55%) is not pushed up by float error
+    percentage = np.round(weighted_totals / MAX_DIMENSION_SCORE * 100, 9)
+    levels = np.searchsorted(thresholds, percentage, side='left') + 1
+    return np.where((percentage < 0) | (levels > len(thresholds)), 0, levels)
+
+def column_letter(col_index):
+    """Mengubah nomor kolom (mulai dari 1) menjadi huruf kolom A1, misal 28 -> AB"""
+    letters = ''
+    while col_index > 0:
+        col_index, remainder = divmod(col_index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def normalize_columns(df):
+    """Menyeragamkan nama kolom format baru/lama dan memvalidasi kolom wajib"""
+    # Validate required columns - check for both old and new format
+    new_format_columns = ['Submission ID', 'Skor Dimensi 1', 'Skor Dimensi 2', 'Skor Dimensi 3', 'Skor Dimensi 4', 'Skor Dimensi 5']
+    old_format_columns = ['Submission ID', 'Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']
+    
+    # Check if new format exists
+    if all(col in df.columns for col in new_format_columns):
+        # Rename new format columns to match the expected format
+        df = df.rename(columns={
+            'Skor Dimensi 1': 'Dimensi 1',
+            'Skor Dimensi 2': 'Dimensi 2', 
+            'Skor Dimensi 3': 'Dimensi 3',
+            'Skor Dimensi 4': 'Dimensi 4',
+            'Skor Dimensi 5': 'Dimensi 5',
+            'Lokasi RS:': 'Lokasi Rumah Sakit',
+            'Nama Responden:': 'Nama Responden',
+            'Jabatan:': 'Jabatan',
+            'Nama Rumah Sakit:': 'Nama Rumah Sakit',
+            'Jumlah Tempat Tidur:': 'Jumlah Tempat Tidur'
+        })
+    elif not all(col in df.columns for col in old_format_columns):
+        missing_columns = [col for col in old_format_columns if col not in df.columns]
+        raise Exception(f"Kolom yang diperlukan tidak ditemukan: {', '.join(missing_columns)}")
+    
+    return df
+
+def validate_snapshot(df):
+    """Memeriksa semua baris sekaligus (vectorized) dan memisahkan baris bermasalah ke tabel karantina
+    
+    Baris dengan Submission ID kosong/duplikat atau skor dimensi tidak valid dikeluarkan dari data.
+    Identitas kosong dan level sheet yang berbeda dengan level aplikasi hanya dicatat sebagai peringatan.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    df = df.copy()
+    
+    submission_ids = df['Submission ID'].astype('string').str.strip()
+    missing_id = submission_ids.isna() | (submission_ids == '')
+    duplicate_id = submission_ids.duplicated(keep='first') & ~missing_id
+    
+    scores = df[DIMENSION_COLUMNS].apply(pd.to_numeric, errors='coerce')
+    invalid_scores = (scores.isna() | (scores < 0) | (scores > MAX_DIMENSION_SCORE)).any(axis=1)
+    
+    missing_identity = {}
+    for col in ['Nama Responden', 'Nama Rumah Sakit']:
+        if col in df.columns:
+            values = df[col].astype('string').str.strip()
+            missing_identity[col] = values.isna() | (values == '')
+    
+    # Level computed by the app vs. the level text written by the sheet formula
+    weight_vector, thresholds = compile_scoring_model()
+    weighted_totals = score_matrix(scores.fillna(0).to_numpy(dtype=np.float64), weight_vector)
+    app_level = pd.Series(bucket_levels(weighted_totals, thresholds), index=df.index)
+    if 'Level AI Maturity' in df.columns:
+        sheet_level = pd.to_numeric(
+            df['Level AI Maturity'].astype('string').str.extract(r'Level\s*(\d)', expand=False),
+            errors='coerce'
+        )
+        level_mismatch = sheet_level.notna() & (sheet_level != app_level) & ~invalid_scores
+    else:
+        level_mismatch = pd.Series(False, index=df.index)
+    
+    rejected_checks = [
+        (missing_id, 'Submission ID kosong'),
+        (duplicate_id, 'Submission ID duplikat'),
+        (invalid_scores, f'Skor dimensi kosong/non-numerik atau di luar 0-{MAX_DIMENSION_SCORE}')
+    ]
+    warning_checks = [(mask, f'{col} kosong') for col, mask in missing_identity.items()]
+    warning_checks.append((level_mismatch, 'Level di sheet berbeda dengan level aplikasi'))
+    
+    reasons = pd.Series('', index=df.index, dtype='string')
+    for mask, reason in rejected_checks + warning_checks:
+        reasons = reasons.mask(mask.to_numpy(), reasons + reason + '; ')
+    
+    rejected = np.logical_or.reduce([mask.to_numpy() for mask, _ in rejected_checks])
+    flagged = (reasons != '').to_numpy()
+    
+    quarantine = pd.DataFrame({
+        'Baris Sheet': df.index[flagged] + 2,
+        'Submission ID': submission_ids[flagged].fillna('').to_numpy(),
+        'Status': np.where(rejected[flagged], 'Dikarantina', 'Peringatan'),
+        'Alasan': reasons[flagged].str.rstrip('; ').to_numpy()
+    })
+    
+    # Clean rows get typed columns so the render path needs no per-row checks
+    clean = df.loc[~rejected].copy()
+    clean['Submission ID'] = submission_ids[~rejected].astype(str)
+    clean_scores = scores.loc[~rejected]
+    if (clean_scores % 1 == 0).all().all():
+        clean_scores = clean_scores.astype('int64')
+    clean[DIMENSION_COLUMNS] = clean_scores
+    for col in ['Nama Responden', 'Jabatan', 'Nama Rumah Sakit', 'Lokasi Rumah Sakit']:
+        if col in clean.columns:
+            clean[col] = clean[col].fillna('-')
+    
+    return clean, quarantine
+
+def compute_row_hashes(df):
+    """Hash isi tiap baris (Submission ID, field identitas, skor dimensi), diindeks dengan Submission ID"""
+    import pandas as pd
+    
+    columns = [col for col in ['Submission ID'] + RECORD_FIELDS if col in df.columns]
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    row_hashes.index = df['Submission ID'].astype(str).to_numpy()
+    return row_hashes
+
+def snapshot_fingerprint(df, row_hashes=None):
+    """Sidik jari isi snapshot, dibentuk dari hash per baris"""
+    if row_hashes is None:
+        row_hashes = compute_row_hashes(df)
+    return hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()[:16]
+
+def fetch_sheet_csv(sheet_id):
+    """Mengunduh seluruh sheet sebagai CSV export (tanpa kredensial)"""
+    import io
+    import pandas as pd
+    import requests
+    
+    # Convert to CSV export URL
+    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+    
+    # Fetch the data with headers to mimic browser request
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    response = requests.get(csv_url, headers=headers, timeout=10)
+    response.raise_for_status()
+    
+    # Check if we got HTML instead of CSV (indicates access denied)
+    if response.text.strip().startswith('<'):
+        raise Exception("Google Sheets tidak dapat diakses. Sheet harus dipublikasikan atau dibuat public.")
+    
+    # Read CSV data (Submission ID as text: 19-digit IDs lose precision as float when a cell is empty)
+    csv_data = io.StringIO(response.text)
+    return pd.read_csv(csv_data, dtype={'Submission ID': str})
+
+def fetch_sheet_api(sheet_id, credentials_info, start_row=2):
+    """Membaca hanya kolom yang dibutuhkan via Sheets API (service account)"""
+    import gspread
+    import pandas as pd
+    
+    client = gspread.service_account_from_dict(dict(credentials_info), scopes=gspread.auth.READONLY_SCOPES)
+    worksheet = client.open_by_key(sheet_id).sheet1
+    
+    # Only the header row is read in full, to locate the needed columns
+    header = worksheet.row_values(1)
+    missing_columns = [col for col in SHEET_API_COLUMNS if col not in header]
+    if missing_columns:
+        raise Exception(f"Kolom yang diperlukan tidak ditemukan: {', '.join(missing_columns)}")
+    
+    wanted_columns = SHEET_API_COLUMNS + [col for col in SHEET_API_OPTIONAL_COLUMNS if col in header]
+    letters = [column_letter(header.index(col) + 1) for col in wanted_columns]
+    ranges = [f"{letter}{start_row}:{letter}" for letter in letters]
+    value_ranges = worksheet.batch_get(ranges, major_dimension='COLUMNS')
+    
+    # Trailing empty cells are omitted by the API, so pad every column to the same length
+    columns = [value_range[0] if value_range else [] for value_range in value_ranges]
+    n_rows = max((len(values) for values in columns), default=0)
+    data = {
+        col: values + [None] * (n_rows - len(values))
+        for col, values in zip(wanted_columns, columns)
+    }
+    df = pd.DataFrame(data, columns=wanted_columns)
+    
+    # Formatted values arrive as text; match the dtypes produced by the CSV export
+    for i in range(1, 6):
+        df[f'Skor Dimensi {i}'] = pd.to_numeric(df[f'Skor Dimensi {i}'], errors='coerce')
+    df['Jumlah Tempat Tidur:'] = pd.to_numeric(df['Jumlah Tempat Tidur:'], errors='coerce')
+    # Keep the same positional index as the CSV export (sheet row - 2)
+    df.index = range(start_row - 2, start_row - 2 + len(df))
+    # Only fully empty rows (padding) are dropped; rows missing just an ID go to quarantine like the CSV path
+    df = df[df.replace('', None).notna().any(axis=1)]
+    
+    return df
+
+def make_snapshot(df, quarantine=None):
+    """Membungkus data bersih menjadi snapshot beserta hash per baris dan sidik jarinya"""
+    import pandas as pd
+    
+    if quarantine is None:
+        quarantine = pd.DataFrame()
+    if df.empty:
+        return {'data': df, 'quarantine': quarantine, 'row_hashes': None, 'fingerprint': None, 'loaded_at': time.time()}
+    
+    row_hashes = compute_row_hashes(df)
+    return {
+        'data': df,
+        'quarantine': quarantine,
+        'row_hashes': row_hashes,
+        'fingerprint': snapshot_fingerprint(df, row_hashes),
+        'loaded_at': time.time()
+    }
+
+def read_sheet_snapshot(sheet_id, start_row=2):
+    """Mengambil, menormalisasi dan memvalidasi snapshot sheet (tanpa cache)
+    
+    Mengembalikan snapshot dari make_snapshot(): data bersih, tabel karantina, hash per baris dan sidik jari.
+    """
+    import pandas as pd
+    
+    # Prefer the column-projected Sheets API read when a service account is configured,
+    # fall back to the full CSV export otherwise
+    df = None
+    if "gcp_service_account" in st.secrets:
+        try:
+            df = fetch_sheet_api(sheet_id, st.secrets["gcp_service_account"], start_row=start_row)
+        except Exception:
+            logger.exception("Sheets API gagal dibaca, memakai CSV export")
+            df = None
+    if df is None:
+        df = fetch_sheet_csv(sheet_id)
+        if start_row > 2:
+            df = df.iloc[start_row - 2:]
+    
+    df = normalize_columns(df)
+    
+    if df.empty:
+        # Return empty DataFrame instead of raising exception
+        return make_snapshot(pd.DataFrame())
+    
+    # Check if DataFrame has data rows (not just headers)
+    if len(df) == 0:
+        return make_snapshot(pd.DataFrame())
+    
+    return make_snapshot(*validate_snapshot(df))
+
+# Shared read-only between sessions (no per-call copy as with st.cache_data); callers must not mutate it
+@st.cache_resource(ttl=SNAPSHOT_TTL_SECONDS, show_spinner=False)
+def fetch_data(sheet_id, start_row=2):
+    """Snapshot sheet yang di-cache selama SNAPSHOT_TTL_SECONDS, dibagi antar sesi"""
+    return read_sheet_snapshot(sheet_id, start_row=start_row)
+
+# Separate short-lived cache for wallboards, so they never shorten the TTL of fetch_data();
+# concurrent ticks wait on the same computation instead of each downloading the sheet
+@st.cache_resource(ttl=WALLBOARD_REFRESH_SECONDS, show_spinner=False)
+def fetch_wallboard_data(sheet_id):
+    """Snapshot sheet untuk wallboard, diambil ulang paling cepat sekali per WALLBOARD_REFRESH_SECONDS"""
+    return read_sheet_snapshot(sheet_id)
+
+# Short-lived cache for deep-link misses: a respondent who opens their link right after submitting
+# is found without waiting for fetch_data() to expire, while unknown IDs cost at most one read per TTL
+@st.cache_resource(ttl=RECORD_MISS_REFRESH_SECONDS, show_spinner=False)
+def fetch_recent_data(sheet_id):
+    """Snapshot sheet untuk submission yang belum ada di snapshot bersama, diambil ulang paling cepat sekali per RECORD_MISS_REFRESH_SECONDS"""
+    return read_sheet_snapshot(sheet_id)
+
+def get_sheet_id():
+    """Mengambil GOOGLE_SHEETS_ID dari Streamlit secrets"""
     try:
-        # Google Sheets URL from Streamlit secrets
+        return st.secrets["GOOGLE_SHEETS_ID"]
+    except KeyError:
+        raise Exception("GOOGLE_SHEETS_ID tidak ditemukan di Streamlit secrets")
+
+def get_bundle_dir():
+    """Folder bundle bersama dari precompute_worker.py (env PRECOMPUTE_BUNDLE_DIR atau secrets); None jika tidak dipakai"""
+    bundle_dir = os.environ.get('PRECOMPUTE_BUNDLE_DIR')
+    if not bundle_dir:
         try:
-            sheet_id = st.secrets["GOOGLE_SHEETS_ID"]
-        except KeyError:
-            raise Exception("GOOGLE_SHEETS_ID tidak ditemukan di Streamlit secrets")
-        
-        # Convert to CSV export URL
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-        
-        # Fetch the data with headers to mimic browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            bundle_dir = st.secrets.get('PRECOMPUTE_BUNDLE_DIR')
+        except Exception:
+            bundle_dir = None
+    return Path(bundle_dir) if bundle_dir else None
+
+def write_arrow_file(df, path):
+    """Menulis DataFrame sebagai file Arrow IPC tanpa kompresi"""
+    import pyarrow as pa
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def read_arrow_file(path):
+    """Membaca file Arrow IPC menjadi DataFrame (salinan di memori proses)"""
+    import pyarrow as pa
+    
+    # The file is read through a memory map, but to_pandas() materialises the columns in process memory
+    with pa.memory_map(str(path), 'r') as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+def write_bundle(bundle_dir, snapshot, artifacts, keep_versions=3):
+    """Menulis snapshot dan artefaknya sebagai bundle berversi, lalu menukar CURRENT secara atomik"""
+    import numpy as np
+    import pandas as pd
+    
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{artifacts['fingerprint']}-{artifacts['model_version']}"
+    
+    # Everything is written to a temporary folder first and renamed into place when complete
+    tmp_dir = Path(tempfile.mkdtemp(dir=bundle_dir, prefix='.tmp-'))
+    write_arrow_file(artifacts['scored'], tmp_dir / BUNDLE_SCORED_FILE)
+    write_arrow_file(snapshot['quarantine'], tmp_dir / BUNDLE_QUARANTINE_FILE)
+    write_arrow_file(
+        pd.DataFrame({
+            'option': artifacts['submission_options'],
+            'Submission ID': [artifacts['submission_mapping'][option] for option in artifacts['submission_options']]
+        }),
+        tmp_dir / BUNDLE_SELECTOR_FILE
+    )
+    write_arrow_file(
+        pd.DataFrame({
+            'Submission ID': artifacts['hospital_clusters'].index,
+            'Kelompok RS': artifacts['hospital_clusters'].to_numpy()
+        }),
+        tmp_dir / BUNDLE_HOSPITALS_FILE
+    )
+    write_arrow_file(artifacts['hospital_rollup'], tmp_dir / BUNDLE_HOSPITAL_ROLLUP_FILE)
+    np.save(tmp_dir / BUNDLE_NEIGHBOURS_FILE, artifacts['neighbour_index']['matrix'])
+    np.save(tmp_dir / BUNDLE_ROW_HASHES_FILE, artifacts['row_hashes'].to_numpy())
+    
+    manifest = {
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'fingerprint': artifacts['fingerprint'],
+        'model_version': artifacts['model_version'],
+        'total_submissions': len(artifacts['scored']),
+        'avg_submission': {
+            key: float(value) if key in DIMENSION_COLUMNS else value
+            for key, value in artifacts['avg_submission'].items()
+        },
+        'dimension_stats': {
+            stat: {dim: float(value) for dim, value in row.items()}
+            for stat, row in artifacts['dimension_stats'].iterrows()
+        },
+        'level_distribution': artifacts['level_distribution'],
+        'score_distribution': {
+            key: value.tolist() for key, value in artifacts['score_distribution'].items()
+        },
+        'bootstrap_intervals': artifacts['bootstrap_intervals'] and {
+            key: value.tolist() if hasattr(value, 'tolist') else value
+            for key, value in artifacts['bootstrap_intervals'].items()
         }
+    }
+    with open(tmp_dir / BUNDLE_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    os.rename(tmp_dir, bundle_dir / version)
+    
+    current_tmp = bundle_dir / f'.{BUNDLE_CURRENT_FILE}.tmp'
+    current_tmp.write_text(version, encoding='utf-8')
+    os.replace(current_tmp, bundle_dir / BUNDLE_CURRENT_FILE)
+    
+    # Old versions are removed; replicas that still map them keep their open handles. Versions are
+    # ordered by write time, since names written within the same second differ only in fingerprint
+    versions = sorted(
+        (path for path in bundle_dir.iterdir() if path.is_dir() and not path.name.startswith('.')),
+        key=lambda path: path.stat().st_mtime_ns
+    )
+    for old_path in versions[:-keep_versions]:
+        if old_path.name == version:
+            continue
+        for child in old_path.iterdir():
+            child.unlink()
+        old_path.rmdir()
+    
+    return version
+
+def read_current_bundle_version(bundle_dir):
+    """Versi bundle yang sedang aktif menurut file CURRENT; None jika belum ada"""
+    try:
+        return (Path(bundle_dir) / BUNDLE_CURRENT_FILE).read_text(encoding='utf-8').strip() or None
+    except FileNotFoundError:
+        return None
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def read_bundle(bundle_path):
+    """Memuat satu versi bundle menjadi snapshot dan artefak siap pakai
+    
+    Tabel Arrow dibaca ke memori proses; matriks .npy (kemiripan dan hash baris) tetap memory-mapped read-only.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    bundle_path = Path(bundle_path)
+    with open(bundle_path / BUNDLE_MANIFEST_FILE, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    scored = read_arrow_file(bundle_path / BUNDLE_SCORED_FILE)
+    scored['Submission ID'] = scored['Submission ID'].astype(str)
+    quarantine = read_arrow_file(bundle_path / BUNDLE_QUARANTINE_FILE)
+    selector = read_arrow_file(bundle_path / BUNDLE_SELECTOR_FILE)
+    hospitals = read_arrow_file(bundle_path / BUNDLE_HOSPITALS_FILE)
+    row_hashes = pd.Series(
+        np.load(bundle_path / BUNDLE_ROW_HASHES_FILE, mmap_mode='r'),
+        index=scored['Submission ID'].to_numpy()
+    )
+    
+    avg_submission = manifest['avg_submission']
+    avg_scores = calculate_ai_maturity_score(avg_submission)
+    spider_fig = create_spider_chart(avg_submission, "Rata-rata")
+    spider_fig.update_layout(
+        title="Rata-rata Semua Submission"
+    )
+    submission_options = selector['option'].tolist()
+    
+    snapshot = {
+        'data': scored,
+        'quarantine': quarantine,
+        'row_hashes': row_hashes,
+        'fingerprint': manifest['fingerprint'],
+        'loaded_at': time.time()
+    }
+    artifacts = {
+        'fingerprint': manifest['fingerprint'],
+        'model_version': manifest['model_version'],
+        'row_hashes': row_hashes,
+        'changed_ids': row_hashes.index[:0],
+        'scored': scored,
+        'avg_submission': avg_submission,
+        'dimension_averages': {dim: avg_submission[dim] for dim in DIMENSION_COLUMNS},
+        'dimension_stats': pd.DataFrame(manifest['dimension_stats']).T,
+        'avg_scores': avg_scores,
+        'avg_maturity': get_ai_maturity_level(avg_scores['weighted_total']),
+        'level_distribution': manifest['level_distribution'],
+        'spider_fig': spider_fig,
+        'submission_options': submission_options,
+        'submission_mapping': dict(zip(submission_options, selector['Submission ID'].astype(str))),
+        'neighbour_index': {
+            'matrix': np.load(bundle_path / BUNDLE_NEIGHBOURS_FILE, mmap_mode='r'),
+            'submission_ids': scored['Submission ID'].to_numpy(),
+            'levels': scored['Level'].to_numpy()
+        },
+        'score_distribution': {
+            key: np.array(value) for key, value in manifest['score_distribution'].items()
+        },
+        'bootstrap_intervals': manifest.get('bootstrap_intervals') and {
+            key: np.array(value) if isinstance(value, list) else value
+            for key, value in manifest['bootstrap_intervals'].items()
+        },
+        'hospital_clusters': pd.Series(
+            hospitals['Kelompok RS'].to_numpy(),
+            index=hospitals['Submission ID'].astype(str).to_numpy(),
+            dtype=object
+        ),
+        'hospital_rollup': read_arrow_file(bundle_path / BUNDLE_HOSPITAL_ROLLUP_FILE),
+        'hospital_partitions': build_hospital_partitions(scored),
+        'partition_artifacts': {}
+    }
+    return snapshot, artifacts
+
+def load_bundle_snapshot(bundle_dir):
+    """Snapshot dari bundle aktif; artefaknya langsung dipasang di cache sehingga replika tidak menghitung ulang"""
+    version = read_current_bundle_version(bundle_dir)
+    if version is None:
+        return None
+    
+    snapshot, artifacts = read_bundle(str(Path(bundle_dir) / version))
+    
+    cache = get_artifact_cache()
+    key = (artifacts['fingerprint'], artifacts['model_version'])
+    with cache['lock']:
+        if key not in cache['entries']:
+            cache['entries'][key] = artifacts
+            while len(cache['entries']) > ARTIFACT_CACHE_ENTRIES:
+                cache['entries'].pop(next(iter(cache['entries'])))
+            # Records are rebuilt lazily from the new bundle's scored frame
+            get_record_store().clear()
+        cache['latest'] = key
+    
+    return snapshot
+
+def read_snapshot(start_row=2):
+    """Snapshot dari bundle bersama jika dikonfigurasi, selain itu langsung dari sheet"""
+    bundle_dir = get_bundle_dir()
+    if bundle_dir is not None and start_row == 2:
+        snapshot = load_bundle_snapshot(bundle_dir)
+        if snapshot is not None:
+            return snapshot
+    return fetch_data(get_sheet_id(), start_row=start_row)
+
+def load_snapshot(start_row=2):
+    """Memuat snapshot lengkap (data, karantina, sidik jari); None jika gagal"""
+    try:
+        return read_snapshot(start_row=start_row)
         
-        response = requests.get(csv_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Check if we got HTML instead of CSV (indicates access denied)
-        if response.text.strip().startswith('<'):
-            raise Exception("Google Sheets tidak dapat diakses. Sheet harus dipublikasikan atau dibuat public.")
-        
-        # Read CSV data
-        csv_data = io.StringIO(response.text)
-        df = pd.read_csv(csv_data)
-        
-        # Validate required columns - check for both old and new format
-        new_format_columns = ['Submission ID', 'Skor Dimensi 1', 'Skor Dimensi 2', 'Skor Dimensi 3', 'Skor Dimensi 4', 'Skor Dimensi 5']
-        old_format_columns = ['Submission ID', 'Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']
-        
-        # Check if new format exists
-        if all(col in df.columns for col in new_format_columns):
-            # Rename new format columns to match the expected format
-            df = df.rename(columns={
-                'Skor Dimensi 1': 'Dimensi 1',
-                'Skor Dimensi 2': 'Dimensi 2', 
-                'Skor Dimensi 3': 'Dimensi 3',
-                'Skor Dimensi 4': 'Dimensi 4',
-                'Skor Dimensi 5': 'Dimensi 5',
-                'Lokasi RS:': 'Lokasi Rumah Sakit',
-                'Nama Responden:': 'Nama Responden',
-                'Jabatan:': 'Jabatan',
-                'Nama Rumah Sakit:': 'Nama Rumah Sakit',
-                'Jumlah Tempat Tidur:': 'Jumlah Tempat Tidur'
-            })
-        elif not all(col in df.columns for col in old_format_columns):
-            missing_columns = [col for col in old_format_columns if col not in df.columns]
-            raise Exception(f"Kolom yang diperlukan tidak ditemukan: {', '.join(missing_columns)}")
-        
-        if df.empty:
-            # Return empty DataFrame instead of raising exception
-            return pd.DataFrame()
-        
-        # Check if DataFrame has data rows (not just headers)
-        if len(df) == 0:
-            return pd.DataFrame()
+    except Exception:
+        logger.exception("Snapshot gagal dimuat")
+        st.info("**Data masih kosong**")
+        return None
+
+def load_data(start_row=2):
+    """Memuat data dari Google Sheets - selalu update real-time"""
+    try:
+        return read_snapshot(start_row=start_row)['data']
         
-        return df
+    except Exception:
+        import pandas as pd
         
-    except Exception as e:
-        # st.error(f"Data Tidak dapat memuat data: {e}")
+        logger.exception("Data gagal dimuat")
         st.info("**Data masih kosong**")
         return pd.DataFrame()  # Return empty DataFrame instead of None
 
 def create_spider_chart(dimensions_data, submission_id):
     """Membuat spider chart untuk 5 dimensi"""
+    import plotly.graph_objects as go
     
     categories = [
         'LEADERSHIP & STRATEGI', 
@@ -260,6 +892,240 @@ def create_spider_chart(dimensions_data, submission_id):
     
     return fig
 
+# Persentil untuk pita distribusi per dimensi pada grafik perbandingan
+COMPARISON_PERCENTILES = [10, 25, 50, 75, 90]
+
+# Maksimal submission individual yang digambar sebagai trace sendiri
+COMPARISON_MAX_TRACES = 8
+
+# Maksimal hasil pencarian yang dikirim ke browser sebagai pilihan grafik perbandingan
+COMPARISON_SEARCH_RESULTS = 20
+
+def calculate_score_distribution(scored):
+    """Persentil per dimensi dan histogram skor (0-15) per dimensi, ukurannya tidak bergantung jumlah submission"""
+    import numpy as np
+    
+    scores = scored[DIMENSION_COLUMNS].to_numpy(dtype=np.float64)
+    percentiles = np.percentile(scores, COMPARISON_PERCENTILES, axis=0)
+    bins = np.clip(np.rint(scores), 0, MAX_DIMENSION_SCORE).astype(np.int64)
+    density = np.stack([
+        np.bincount(bins[:, j], minlength=MAX_DIMENSION_SCORE + 1)
+        for j in range(len(DIMENSION_COLUMNS))
+    ])
+    return {'percentiles': percentiles, 'density': density}
+
+def search_submission_options(options, query, limit=COMPARISON_SEARCH_RESULTS):
+    """Paling banyak `limit` pilihan "<nama responden> (ID: <id>)" yang memuat `query` (tanpa membedakan huruf besar/kecil)"""
+    import pandas as pd
+    
+    options = pd.Series(options, dtype=object)
+    query = (query or '').strip()
+    if query:
+        options = options[options.str.contains(query, case=False, regex=False)]
+    return options.head(limit).tolist()
+
+def bootstrap_resample_counts(values, rng, resamples=BOOTSTRAP_RESAMPLES):
+    """Semua resample bootstrap sekaligus sebagai matriks hitungan (resample x nilai unik)
+    
+    Menarik n baris dengan pengembalian dari nilai diskrit setara dengan satu tarikan multinomial atas
+    frekuensi nilai uniknya, sehingga ukuran matriks tidak bergantung jumlah submission.
+    """
+    import numpy as np
+    
+    uniques, counts = np.unique(values, return_counts=True)
+    draws = rng.multinomial(len(values), counts / len(values), size=resamples)
+    return uniques, draws
+
+def bootstrap_interval(statistics, confidence=BOOTSTRAP_CONFIDENCE):
+    """Selang persentil (bawah, atas) dari statistik bootstrap per kolom"""
+    import numpy as np
+    
+    tail = (1 - confidence) / 2 * 100
+    return np.percentile(statistics, [tail, 100 - tail], axis=0).T
+
+def calculate_bootstrap_intervals(scored, fingerprint, resamples=BOOTSTRAP_RESAMPLES):
+    """Selang kepercayaan bootstrap untuk rata-rata per dimensi, skor tertimbang dan proporsi level
+    
+    Seed diambil dari sidik jari snapshot sehingga hasilnya sama di setiap replika.
+    """
+    import numpy as np
+    
+    total = len(scored)
+    if total == 0:
+        return None
+    
+    rng = np.random.default_rng(int(fingerprint, 16))
+    scores = scored[DIMENSION_COLUMNS].to_numpy(dtype=np.float64)
+    weight_vector, _ = compile_scoring_model()
+    
+    def mean_interval(values):
+        uniques, draws = bootstrap_resample_counts(values, rng, resamples)
+        return bootstrap_interval(draws @ uniques / total)
+    
+    # Level shares come from one multinomial over all levels (including 0, out of range)
+    # so the shares within a resample stay consistent with each other
+    levels = np.array([level['level'] for level in SCORING_MODEL['levels']])
+    level_counts = np.bincount(scored['Level'].to_numpy(), minlength=levels.max() + 1)
+    level_draws = rng.multinomial(total, level_counts / total, size=resamples)[:, levels]
+    
+    return {
+        'confidence': BOOTSTRAP_CONFIDENCE,
+        'resamples': resamples,
+        'dimensions': np.stack([mean_interval(scores[:, j]) for j in range(len(DIMENSION_COLUMNS))]),
+        # Rounded so float noise in the weighted sum does not split identical totals into separate values
+        'weighted_total': mean_interval(np.round(score_matrix(scores, weight_vector), 6)),
+        'level_shares': bootstrap_interval(level_draws / total)
+    }
+
+def format_interval(interval, fmt='{:.2f}'):
+    """Teks selang kepercayaan, misal 95% CI: 7.10 - 8.40"""
+    low, high = interval
+    return f"{BOOTSTRAP_CONFIDENCE:.0%} CI: {fmt.format(low)} - {fmt.format(high)}"
+
+def create_comparison_chart(score_distribution, selected_submissions=None, use_webgl=False):
+    """Spider chart perbandingan teragregasi: pita persentil, densitas radial dan beberapa submission pilihan"""
+    import numpy as np
+    import plotly.graph_objects as go
+    
+    trace_type = go.Scatterpolargl if use_webgl else go.Scatterpolar
+    categories = [dim_detail[dim] for dim in DIMENSION_COLUMNS]
+    closed_categories = categories + categories[:1]
+    
+    def closed(values):
+        values = list(values)
+        return values + values[:1]
+    
+    percentiles = dict(zip(COMPARISON_PERCENTILES, score_distribution['percentiles']))
+    fig = go.Figure()
+    
+    # Percentile envelopes: outer band P10-P90, inner band P25-P75, median line
+    for low, high, fillcolor in [(10, 90, 'rgba(31, 78, 121, 0.15)'), (25, 75, 'rgba(31, 78, 121, 0.30)')]:
+        fig.add_trace(trace_type(
+            r=closed(percentiles[high]),
+            theta=closed_categories,
+            mode='lines',
+            line=dict(color='rgba(31, 78, 121, 0.4)', width=1),
+            name=f'P{high}',
+            hoverinfo='r+name'
+        ))
+        fig.add_trace(trace_type(
+            r=closed(percentiles[low]),
+            theta=closed_categories,
+            mode='lines',
+            fill='tonext',
+            fillcolor=fillcolor,
+            line=dict(color='rgba(31, 78, 121, 0.4)', width=1),
+            name=f'P{low}-P{high}',
+            hoverinfo='r+name'
+        ))
+    fig.add_trace(trace_type(
+        r=closed(percentiles[50]),
+        theta=closed_categories,
+        mode='lines',
+        line=dict(color='rgb(31, 78, 121)', width=3),
+        name='Median'
+    ))
+    
+    # Binned radial density: one marker per (dimension, score) bin, sized by submission count
+    density = score_distribution['density']
+    dim_idx, score_bins = np.nonzero(density)
+    counts = density[dim_idx, score_bins]
+    fig.add_trace(trace_type(
+        r=score_bins,
+        theta=[categories[i] for i in dim_idx],
+        mode='markers',
+        marker=dict(
+            size=6 + 18 * np.sqrt(counts / counts.max()),
+            color=counts,
+            colorscale='Greens',
+            showscale=False,
+            opacity=0.8
+        ),
+        name='Jumlah submission',
+        customdata=counts,
+        hovertemplate='%{theta}<br>Skor %{r}: %{customdata} submission<extra></extra>'
+    ))
+    
+    # Individual traces only for the small, explicitly selected subset
+    for label, submission_data in (selected_submissions or {}).items():
+        fig.add_trace(trace_type(
+            r=closed(submission_data[dim] for dim in DIMENSION_COLUMNS),
+            theta=closed_categories,
+            mode='lines+markers',
+            line=dict(width=2),
+            name=label
+        ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, MAX_DIMENSION_SCORE + 1],
+                tickfont=dict(size=10),
+                gridcolor='lightgray'
+            ),
+            angularaxis=dict(
+                tickfont=dict(size=11, color='#1f4e79'),
+                direction='clockwise'
+            )
+        ),
+        showlegend=True,
+        title=dict(
+            text="Distribusi Skor Semua Submission",
+            x=0.5,
+            font=dict(size=16, color='#1f4e79')
+        ),
+        font=dict(size=10),
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        autosize=True,
+        margin=dict(l=100, r=100, t=80, b=80),
+    )
+    
+    return fig
+
+def display_comparison_chart(artifacts):
+    """Menampilkan grafik perbandingan semua submission dalam bentuk teragregasi"""
+    st.markdown("### Perbandingan Semua Submission")
+    
+    # Only search matches and the current selection are sent to the browser, never one option per submission
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        query = st.text_input(
+            "Cari submission (nama responden atau ID):",
+            key="comparison_search"
+        )
+    selected_before = [
+        option for option in st.session_state.get('comparison_selection', [])
+        if option in artifacts['submission_mapping']
+    ]
+    matches = search_submission_options(artifacts['submission_options'], query)
+    with col2:
+        selected_options = st.multiselect(
+            f"Tampilkan submission individual (maks. {COMPARISON_MAX_TRACES}):",
+            options=selected_before + [option for option in matches if option not in selected_before],
+            default=selected_before,
+            max_selections=COMPARISON_MAX_TRACES,
+            key="comparison_selection"
+        )
+    with col3:
+        use_webgl = st.checkbox("Render WebGL", value=False, key="comparison_webgl")
+    
+    scored = artifacts['scored']
+    selected_ids = [artifacts['submission_mapping'][option] for option in selected_options]
+    selected_rows = scored.set_index('Submission ID').loc[selected_ids, DIMENSION_COLUMNS] if selected_ids else None
+    selected_submissions = {
+        option: selected_rows.loc[sub_id]
+        for option, sub_id in zip(selected_options, selected_ids)
+    } if selected_ids else None
+    
+    fig = create_comparison_chart(artifacts['score_distribution'], selected_submissions, use_webgl)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        "Pita menunjukkan rentang persentil P10-P90 dan P25-P75 per dimensi; "
+        "ukuran titik menunjukkan jumlah submission pada skor tersebut."
+    )
+
 def display_submission_details(submission_data):
     """Menampilkan informasi detail tentang submission"""
     
@@ -298,22 +1164,10 @@ def calculate_ai_maturity_score(submission_data):
     """Menghitung skor AI maturity berdasarkan dimensi dan bobotnya"""
     
     # Definisi bobot untuk setiap dimensi
-    weights = {
-        'Dimensi 1': 0.25,  # Leadership & Strategi - 25%
-        'Dimensi 2': 0.25,  # Data & Infrastruktur - 25%
-        'Dimensi 3': 0.20,  # Use Case AI - 20%
-        'Dimensi 4': 0.10,   # Tata Kelola & Etika - 10%
-        'Dimensi 5': 0.20  # SDM & Kompetensi - 20%
-    }
+    weights = DIMENSION_WEIGHTS
     
     # Nama dimensi yang lebih deskriptif
-    dimension_names = {
-        'Dimensi 1': 'Leadership & Strategi',
-        'Dimensi 2': 'Data & Infrastruktur',
-        'Dimensi 3': 'Use Case AI',
-        'Dimensi 4': 'Tata Kelola & Etika',
-        'Dimensi 5': 'SDM & Kompetensi'
-    }
+    dimension_names = {dim['key']: dim['name'] for dim in SCORING_MODEL['dimensions']}
     
     # Hitung skor mentah total (dari 75 poin maksimal)
     raw_total = sum([submission_data[f'Dimensi {i}'] for i in range(1, 6)])
@@ -341,108 +1195,42 @@ def calculate_ai_maturity_score(submission_data):
     }
 
 def get_ai_maturity_level(score):
-    """Menentukan level AI maturity berdasarkan skor"""
+    """Menentukan level AI maturity berdasarkan skor (batas, nama dan uraian level dari model skor)"""
     # Convert weighted score (0-15) to percentage scale (0-100) for easier comparison
     # Then map to the original 15-75 scale for level determination
-    percentage = (score / 15) * 100
+    percentage = (score / MAX_DIMENSION_SCORE) * 100
     scaled_score = (percentage / 100) * 60 + 15  # Scale to 15-75 range
     
-    if percentage <= 35:
-        return {
-            'level': 1,
-            'name': 'Awareness',
-            'description': 'RS baru menyadari potensi AI',
-            'characteristics': [
-                'Belum ada inisiatif konkret atau pilot project',
-                'Fokus: Education dan awareness building'
-            ],
-            'next_steps': [
-                'Edukasi manajemen dan staf mengenai potensi AI di layanan kesehatan melalui workshop atau webinar',
-                'Lakukan benchmarking ke RS lain yang sudah menggunakan AI',
-                'Petakan area sederhana yang cocok untuk dijadikan pilot project'
-            ],
-            'color': '#ff6b6b'
-        }
-    elif percentage <= 55:
-        return {
-            'level': 2,
-            'name': 'Exploration',
-            'description': 'Pilot project terbatas dan uji coba awal',
-            'characteristics': [
-                'Investasi minimal untuk proof of concept (PoC)',
-                'Fokus: Learning dan experimentation'
-            ],
-            'next_steps': [
-                'Evaluasi hasil 1-2 pilot project dan dokumentasikan lessons learned',
-                'Buat business case untuk scaling solusi AI yang berhasil',
-                'Tingkatkan infrastruktur IT untuk mendukung implementasi yang lebih luas'
-            ],
-            'color': '#ffa726'
-        }
-    elif percentage <= 75:
-        return {
-            'level': 3,
-            'name': 'Implementation',
-            'description': 'Beberapa solusi AI berjalan operasional',
-            'characteristics': [
-                'Mulai ada governance dan standar penggunaan AI',
-                'Fokus: Standardisasi dan integrasi sistem'
-            ],
-            'next_steps': [
-                'Standardisasi proses implementasi AI di seluruh departemen',
-                'Integrasikan sistem AI dengan workflow yang sudah ada',
-                'Kembangkan policy dan SOP penggunaan AI yang lebih komprehensif'
-            ],
-            'color': '#66bb6a'
-        }
-    elif percentage <= 90:
-        return {
-            'level': 4,
-            'name': 'Scale-Up',
-            'description': 'AI terintegrasi dalam operasional utama',
-            'characteristics': [
-                'Ada strategy roadmap dan resource yang dedicated untuk AI',
-                'Fokus: Optimisasi dan ekspansi'
-            ],
-            'next_steps': [
-                'Optimalisasi ROI dari investasi AI yang sudah ada',
-                'Ekspansi ke use case AI yang lebih advanced dan kompleks',
-                'Bangun sistem pemantauan berkala untuk mengevaluasi impact dari AI'
-            ],
-            'color': '#42a5f5'
-        }
-    elif percentage <= 100:
-        return {
-            'level': 5,
-            'name': 'Transformation',
-            'description': 'AI menjadi core competitive advantage',
-            'characteristics': [
-                'Continuous innovation dan improvement culture',
-                'Fokus: Leadership dan best practices'
-            ],
-            'next_steps': [
-                'Menjadi center of excellence untuk AI implementation di healthcare',
-                'Kolaborasi dengan institusi penelitian untuk mengembangkan AI baru',
-                'Mentoring dan knowledge sharing dengan rumah sakit lain dalam ekosistem'
-            ],
-            'color': '#ab47bc'
-        }
-    else:
-        return {
-            'level': 0,
-            'name': 'Invalid',
-            'description': f'Skor tidak valid: {percentage:.2f} (dari score: {score:.2f})',
-            'characteristics': [f'Score range should be 15-75, got {scaled_score:.2f}'],
-            'next_steps': 'Periksa kembali perhitungan skor',
-            'color': '#757575'
-        }
+    # Same bucketing (and boundary rounding) as bucket_levels(): the first level whose upper bound is not below the score
+    if percentage >= 0:
+        for level in SCORING_MODEL['levels']:
+            if round(percentage, 9) <= level['max_percentage']:
+                return {key: level[key] for key in LEVEL_DETAIL_FIELDS}
+    
+    return {
+        'level': 0,
+        'name': 'Invalid',
+        'description': f'Skor tidak valid: {percentage:.2f} (dari score: {score:.2f})',
+        'characteristics': [f'Score range should be 15-75, got {scaled_score:.2f}'],
+        'next_steps': 'Periksa kembali perhitungan skor',
+        'color': '#757575'
+    }
+
+def format_level_range(level_num):
+    """Label rentang persentase skor sebuah level, sama dengan bucketing bucket_levels(): batas bawah eksklusif, batas atas inklusif"""
+    upper = LEVEL_THRESHOLDS[level_num - 1]
+    if level_num == 1:
+        return f"0-{upper}"
+    return f">{LEVEL_THRESHOLDS[level_num - 2]}-{upper}"
 
-def display_ai_maturity_analysis(submission_data):
+def display_ai_maturity_analysis(submission_data, scores=None, maturity_level=None):
     """Menampilkan analisis AI maturity lengkap"""
     
-    # Hitung skor
-    scores = calculate_ai_maturity_score(submission_data)
-    maturity_level = get_ai_maturity_level(scores['weighted_total'])
+    # Hitung skor (kecuali sudah dihitung sebelumnya di record store)
+    if scores is None:
+        scores = calculate_ai_maturity_score(submission_data)
+    if maturity_level is None:
+        maturity_level = get_ai_maturity_level(scores['weighted_total'])
     
     st.markdown("---")
     st.markdown('<div class="submission-header">Perhitungan Skor AI Maturity</div>', unsafe_allow_html=True)
@@ -450,18 +1238,15 @@ def display_ai_maturity_analysis(submission_data):
     # Tabel perhitungan skor
     st.markdown("### PERHITUNGAN SKOR AKHIR")
     
-    # Create a detailed scoring table
-    scoring_data = []
-    for dim_key, data in scores['weighted_scores'].items():
-        scoring_data.append({
-            'Dimensi': data['name'],
-            'Skor': f"{data['raw']}/15",
-            'Bobot': f"{data['weight_percent']:.0f}%",
-            'Skor Tertimbang': f"{data['weighted']:.2f}"
-        })
-    
-    df_scoring = pd.DataFrame(scoring_data)
-    st.dataframe(df_scoring, use_container_width=True, hide_index=True)
+    # Create a detailed scoring table (plain markdown, so this page does not need pandas)
+    scoring_rows = [
+        f"| {data['name']} | {data['raw']}/15 | {data['weight_percent']:.0f}% | {data['weighted']:.2f} |"
+        for data in scores['weighted_scores'].values()
+    ]
+    st.markdown("\n".join([
+        "| Dimensi | Skor | Bobot | Skor Tertimbang |",
+        "|---|---|---|---|"
+    ] + scoring_rows))
     
     # Total scores
     col1, col2, col3 = st.columns(3)
@@ -529,24 +1314,17 @@ def display_ai_maturity_analysis(submission_data):
     st.markdown("---")
     st.markdown("### 📚 REFERENSI LEVEL AI MATURITY")
     
-    all_levels = [
-        (1, "Awareness", "20-35", "#ff6b6b"),
-        (2, "Exploration", "36-55", "#ffa726"),
-        (3, "Implementation", "56-75", "#66bb6a"),
-        (4, "Scale-Up", "76-90", "#42a5f5"),
-        (5, "Transformation", "91-100", "#ab47bc")
-    ]
-    
-    for level_num, level_name, score_range, color in all_levels:
+    # Ranges and descriptions come from the same scoring model used by get_ai_maturity_level()
+    for level in SCORING_MODEL['levels']:
+        level_num = level['level']
+        level_name = level['name']
+        score_range = format_level_range(level_num)
+        
+        color = level['color']
         is_current = level_num == maturity_level['level']
         border_style = f"border: 3px solid {color};" if is_current else f"border: 1px solid {color};"
         opacity = "1" if is_current else "0.7"
         
-        # Convert raw score range (15-75) to weighted score range (0-15) for proper level calculation
-        percentage_avg = (int(score_range.split('-')[0]) + int(score_range.split('-')[1])) / 2
-        weighted_score_avg = (percentage_avg) / 100 * 15  # Convert 15-75 range to 0-15 range
-        level_info = get_ai_maturity_level(weighted_score_avg)
-        
         st.markdown(f"""
         <div style="
             {border_style}
@@ -559,13 +1337,13 @@ def display_ai_maturity_analysis(submission_data):
             <h4 style="color: {color}; margin: 0;">
                 Level {level_num}: {level_name} (Skor {score_range}%)
             </h4>
-            <p style="margin: 0.3rem 0;"><strong>{level_info['description']}</strong></p>
+            <p style="margin: 0.3rem 0;"><strong>{level['description']}</strong></p>
             <ul style="margin: 0.3rem 0; padding-left: 1.2rem;">
-                {''.join([f'<li>{char}</li>' for char in level_info['characteristics']])}
+                {''.join([f'<li>{char}</li>' for char in level['characteristics']])}
             </ul>
             <p style="margin: 0.3rem 0;"><strong>Next Steps:</strong></p>
             <ul style="margin: 0.3rem 0; padding-left: 1.2rem;">
-                {''.join([f'<li>{step}</li>' for step in level_info['next_steps']])}
+                {''.join([f'<li>{step}</li>' for step in level['next_steps']])}
             </ul>
         </div>
         """, unsafe_allow_html=True)
@@ -594,11 +1372,702 @@ def calculate_all_submissions_average(df):
     
     return avg_submission, dimension_averages
 
-def display_all_submissions_overview(df):
-    """Menampilkan overview semua submission dengan rata-rata"""
+def display_what_if_panel(df):
+    """Panel simulasi: ubah bobot dimensi dan hitung ulang level semua submission secara instan"""
+    import numpy as np
+    import pandas as pd
+    
+    with st.expander("🧪 Simulasi Bobot (What-if)"):
+        st.caption(f"Model skor versi {SCORING_MODEL['version']}. Bobot dinormalisasi otomatis menjadi 100%.")
+        
+        weight_cols = st.columns(len(DIMENSION_COLUMNS))
+        raw_weights = {}
+        for i, dim in enumerate(DIMENSION_COLUMNS):
+            with weight_cols[i]:
+                raw_weights[dim] = st.number_input(
+                    f"{dim}: {dim_detail[dim]}",
+                    min_value=0,
+                    max_value=100,
+                    value=int(round(DIMENSION_WEIGHTS[dim] * 100)),
+                    step=5,
+                    key=f"what_if_weight_{dim}"
+                )
+        
+        total = sum(raw_weights.values())
+        if total == 0:
+            st.warning("Total bobot tidak boleh 0%")
+            return
+        weights = {dim: value / total for dim, value in raw_weights.items()}
+        
+        # One matrix product and one searchsorted over all rows, no per-row scoring
+        started = time.perf_counter()
+        scores = df[DIMENSION_COLUMNS].to_numpy(dtype=np.float64)
+        base_weights, thresholds = compile_scoring_model()
+        what_if_weights, _ = compile_scoring_model(weights)
+        base_totals = score_matrix(scores, base_weights)
+        what_if_totals = score_matrix(scores, what_if_weights)
+        base_counts = np.bincount(bucket_levels(base_totals, thresholds), minlength=len(thresholds) + 1)
+        what_if_counts = np.bincount(bucket_levels(what_if_totals, thresholds), minlength=len(thresholds) + 1)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                label="Rata-rata Skor (What-if)",
+                value=f"{what_if_totals.mean():.2f}/15",
+                delta=f"{what_if_totals.mean() - base_totals.mean():+.2f}"
+            )
+        with col2:
+            st.metric(
+                label="Waktu Hitung Ulang",
+                value=f"{elapsed_ms:.1f} ms",
+                help=f"Skor dan level {len(df)} submission dihitung ulang sekaligus"
+            )
+        
+        comparison = pd.DataFrame({
+            'Level': [f"Level {level['level']} - {level['name']}" for level in SCORING_MODEL['levels']],
+            'Bobot Saat Ini': base_counts[1:],
+            'What-if': what_if_counts[1:],
+            'Selisih': what_if_counts[1:] - base_counts[1:]
+        })
+        st.dataframe(comparison, use_container_width=True, hide_index=True)
+
+def build_scored_frame(df):
+    """Menambahkan skor mentah, skor tertimbang, persentase dan level ke semua baris (vectorized)"""
+    import numpy as np
+    
+    weight_vector, thresholds = compile_scoring_model()
+    scores = df[DIMENSION_COLUMNS].to_numpy(dtype=np.float64)
+    weighted_totals = score_matrix(scores, weight_vector)
+    levels = bucket_levels(weighted_totals, thresholds)
+    level_names = np.array(['Invalid'] + [level['name'] for level in SCORING_MODEL['levels']], dtype=object)
+    
+    columns = [col for col in ['Submission ID'] + RECORD_FIELDS if col in df.columns]
+    scored = df[columns].reset_index(drop=True)
+    scored['Total Skor Mentah'] = df[DIMENSION_COLUMNS].sum(axis=1).to_numpy()
+    scored['Skor Tertimbang'] = weighted_totals.round(2)
+    scored['Persentase'] = (weighted_totals / MAX_DIMENSION_SCORE * 100).round(1)
+    scored['Level'] = levels
+    scored['Nama Level'] = level_names[levels]
+    scored['Versi Model Skor'] = SCORING_MODEL['version']
+    return scored
+
+def update_scored_frame(df, unchanged, previous_scored):
+    """Memberi skor hanya pada baris yang berubah; baris lain diambil dari hasil snapshot sebelumnya"""
+    import pandas as pd
+    
+    if previous_scored is None or not unchanged.any():
+        return build_scored_frame(df)
+    
+    submission_ids = df['Submission ID'].astype(str).to_numpy()
+    reused = previous_scored.set_index('Submission ID').loc[submission_ids[unchanged]]
+    fresh = build_scored_frame(df.loc[~unchanged]).set_index('Submission ID')
+    return pd.concat([reused, fresh]).loc[submission_ids].reset_index()
+
+def build_neighbour_index(scored):
+    """Index tetangga terdekat: matriks float32 contiguous berisi skor dimensi yang dinormalisasi (0-1)"""
+    import numpy as np
+    
+    matrix = scored[DIMENSION_COLUMNS].to_numpy(dtype=np.float32) / np.float32(MAX_DIMENSION_SCORE)
+    return {
+        'matrix': np.ascontiguousarray(matrix),
+        'submission_ids': scored['Submission ID'].astype(str).to_numpy(),
+        'levels': scored['Level'].to_numpy()
+    }
+
+def find_similar_submissions(neighbour_index, dimension_scores, k=5, exclude_id=None):
+    """Mencari k submission dengan profil dimensi paling mirip (jarak Euclidean, satu pass vectorized)
+    
+    Mengembalikan list (posisi baris, jarak) terurut dari yang paling mirip.
+    """
+    import numpy as np
+    
+    matrix = neighbour_index['matrix']
+    query = np.asarray(dimension_scores, dtype=np.float32) / np.float32(MAX_DIMENSION_SCORE)
+    diff = matrix - query
+    distances = np.einsum('ij,ij->i', diff, diff)
+    if exclude_id is not None:
+        distances[neighbour_index['submission_ids'] == exclude_id] = np.inf
+    
+    # argpartition picks the k smallest in O(n); only those k are sorted
+    k = min(k, int(np.isfinite(distances).sum()))
+    if k <= 0:
+        return []
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest])]
+    return [(int(pos), float(np.sqrt(distances[pos]))) for pos in nearest]
+
+def canonicalize_hospital_name(name):
+    """Kunci pencocokan nama RS: huruf kecil, tanpa tanda baca, jenis RS diseragamkan (RSUD, RSIA...) dan "RS" umum dibuang"""
+    name = re.sub(r'[^\w\s]', ' ', str(name).lower())
+    name = re.sub(r'\s+', ' ', name).strip()
+    for pattern, replacement in HOSPITAL_TYPE_PATTERNS:
+        name = re.sub(pattern, replacement, name)
+    tokens = [token for token in name.split() if token not in HOSPITAL_GENERIC_TOKENS]
+    return ' '.join(tokens)
+
+def hospital_name_signature(canonical):
+    """Token nama kanonik yang wajib sama agar dua nama boleh digabung: jenis RS, nomor dan angka romawi"""
+    return frozenset(
+        token for token in canonical.split()
+        if token in HOSPITAL_TYPE_TOKENS or token.isdigit() or HOSPITAL_ROMAN_NUMERAL.fullmatch(token)
+    )
+
+def name_trigrams(canonical):
+    """Himpunan trigram karakter dari nama kanonik (diberi padding spasi)"""
+    padded = f"  {canonical} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+@st.cache_resource
+def get_hospital_index():
+    """Index n-gram nama RS per proses; nama baru ditambahkan secara inkremental antar snapshot"""
+    return {
+        'parent': {},                  # union-find over canonical names
+        'grams': {},                   # canonical name -> trigram set
+        'signatures': {},              # canonical name -> must-match tokens
+        'postings': defaultdict(set)   # trigram -> canonical names (blocking index)
+    }
+
+def find_hospital_cluster(index, canonical):
+    """Akar cluster (union-find dengan path halving) untuk nama kanonik"""
+    parent = index['parent']
+    while parent[canonical] != canonical:
+        parent[canonical] = parent[parent[canonical]]
+        canonical = parent[canonical]
+    return canonical
+
+def add_hospital_name(index, canonical):
+    """Menambahkan nama kanonik ke index dan menggabungkannya dengan nama mirip yang sudah ada
+    
+    Hanya nama yang berbagi trigram (lewat posting list) yang dibandingkan, jadi biayanya hampir linear.
+    Nama dengan jenis RS, nomor atau angka romawi berbeda tidak pernah digabung, sehingga satu cluster
+    juga tidak bisa merangkai fasilitas berbeda secara transitif.
+    """
+    if canonical in index['parent']:
+        return
+    
+    grams = name_trigrams(canonical)
+    signature = hospital_name_signature(canonical)
+    shared_counts = Counter()
+    for gram in grams:
+        posting = index['postings'][gram]
+        # Very common n-grams carry little signal and would make blocking quadratic
+        if len(posting) <= HOSPITAL_MAX_POSTING:
+            shared_counts.update(posting)
+    
+    index['parent'][canonical] = canonical
+    for other, shared in shared_counts.items():
+        if index['signatures'][other] != signature:
+            continue
+        jaccard = shared / (len(grams) + len(index['grams'][other]) - shared)
+        if jaccard >= HOSPITAL_MATCH_THRESHOLD:
+            root, other_root = find_hospital_cluster(index, canonical), find_hospital_cluster(index, other)
+            if root != other_root:
+                index['parent'][max(root, other_root)] = min(root, other_root)
+    
+    for gram in grams:
+        index['postings'][gram].add(canonical)
+    index['grams'][canonical] = grams
+    index['signatures'][canonical] = signature
+
+def resolve_hospitals(scored):
+    """Cluster RS untuk setiap baris (kunci cluster, '' jika nama kosong), diindeks dengan Submission ID"""
+    import pandas as pd
+    
+    if 'Nama Rumah Sakit' not in scored.columns:
+        return pd.Series('', index=scored['Submission ID'].to_numpy())
+    
+    # Work on distinct spellings only; respondents of the same hospital repeat names a lot
+    codes, raw_names = pd.factorize(scored['Nama Rumah Sakit'].astype(str).str.strip())
+    canonical_names = [canonicalize_hospital_name(name) if name not in ('', '-', 'nan') else '' for name in raw_names]
+    
+    index = get_hospital_index()
+    for canonical in canonical_names:
+        if canonical:
+            add_hospital_name(index, canonical)
+    cluster_keys = [find_hospital_cluster(index, canonical) if canonical else '' for canonical in canonical_names]
+    
+    return pd.Series(
+        pd.Index(cluster_keys, dtype=object)[codes].to_numpy() if len(codes) else [],
+        index=scored['Submission ID'].to_numpy(),
+        dtype=object
+    )
+
+def build_hospital_rollup(scored, hospital_clusters):
+    """Agregat skor dan level per RS (cluster varian nama), diurutkan dari skor tertinggi"""
+    import numpy as np
+    import pandas as pd
+    
+    frame = scored.assign(
+        _cluster=hospital_clusters.to_numpy(),
+        _name=scored['Nama Rumah Sakit'].astype(str).str.strip()
+    )
+    frame = frame[frame['_cluster'] != '']
+    if frame.empty:
+        return pd.DataFrame()
+    
+    grouped = frame.groupby('_cluster', sort=False)
+    rollup = grouped[DIMENSION_COLUMNS + ['Skor Tertimbang']].mean()
+    
+    # Most frequent spelling in the cluster is used as its display name
+    name_counts = frame.groupby(['_cluster', '_name'], sort=False).size()
+    display_names = (
+        name_counts.sort_values(ascending=False, kind='stable')
+        .reset_index()
+        .drop_duplicates('_cluster')
+        .set_index('_cluster')['_name']
+    )
+    rollup.insert(0, 'Rumah Sakit', display_names.reindex(rollup.index))
+    rollup.insert(1, 'Jumlah Submission', grouped.size())
+    rollup.insert(2, 'Varian Nama', name_counts.groupby(level=0).size().reindex(rollup.index))
+    
+    _, thresholds = compile_scoring_model()
+    levels = bucket_levels(rollup['Skor Tertimbang'].to_numpy(dtype=np.float64), thresholds)
+    level_names = np.array(['Invalid'] + [level['name'] for level in SCORING_MODEL['levels']], dtype=object)
+    rollup['Level'] = [f"Level {level} - {name}" for level, name in zip(levels, level_names[levels])]
+    
+    rollup[DIMENSION_COLUMNS] = rollup[DIMENSION_COLUMNS].round(1)
+    rollup['Skor Tertimbang'] = rollup['Skor Tertimbang'].round(2)
+    rollup.index.name = 'Kelompok RS'
+    return rollup.sort_values('Skor Tertimbang', ascending=False).reset_index()
+
+def display_hospital_rollup(artifacts):
+    """Menampilkan rekap skor per rumah sakit (varian penulisan nama digabung)"""
+    rollup = artifacts['hospital_rollup']
+    if rollup.empty:
+        return
+    
+    # Scoped (per-hospital) artifacts carry a per-location rollup instead
+    if 'name' in artifacts:
+        st.markdown("### Rekap per Lokasi")
+    else:
+        st.markdown("### Rekap per Rumah Sakit")
+        st.caption(
+            "Varian penulisan nama RS (RS/Rumah Sakit, huruf besar/kecil, tanda baca, salah ketik kecil) digabung menjadi satu RS; "
+            "nama dengan jenis RS (RSUD, RSIA, ...), nomor atau angka romawi berbeda tetap dipisah."
+        )
+    st.dataframe(
+        rollup.drop(columns=['Kelompok RS']).rename(columns=dim_detail),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def build_hospital_partitions(scored):
+    """Partisi baris per RS beserta agregat yang bisa dijumlahkan, dibangun sekali per snapshot
+    
+    Kunci partisi adalah nama kanonik persis (tanpa pencocokan fuzzy), sehingga aman dipakai untuk
+    membatasi akses; cluster fuzzy hanya dipakai untuk tampilan rekap per RS.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if 'Nama Rumah Sakit' not in scored.columns or scored.empty:
+        return {}
+    
+    # Canonical names are computed once per distinct spelling
+    raw_codes, raw_names = pd.factorize(scored['Nama Rumah Sakit'].astype(str).str.strip())
+    canonical_names = np.array(
+        [canonicalize_hospital_name(name) if name not in ('', '-', 'nan') else '' for name in raw_names] or [''],
+        dtype=object
+    )
+    canonical = canonical_names[raw_codes]
+    named = np.flatnonzero(canonical != '')
+    if not len(named):
+        return {}
+    
+    # One stable sort groups the row positions of every partition; aggregates are
+    # computed for all partitions at once and only the final assembly loops per RS
+    codes, keys = pd.factorize(canonical[named])
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+    rows = np.split(named[order], bounds[1:-1])
+    
+    scores = scored[DIMENSION_COLUMNS].to_numpy(dtype=np.float64)[named]
+    grouped = pd.DataFrame(scores).groupby(codes, sort=True)
+    sums = grouped.sum().to_numpy()
+    sums_of_squares = pd.DataFrame(scores ** 2).groupby(codes, sort=True).sum().to_numpy()
+    minimums = grouped.min().to_numpy()
+    maximums = grouped.max().to_numpy()
+    
+    n_levels = len(LEVEL_THRESHOLDS) + 1
+    level_counts = np.bincount(
+        codes * n_levels + scored['Level'].to_numpy()[named],
+        minlength=len(keys) * n_levels
+    ).reshape(len(keys), n_levels)
+    
+    # Most frequent spelling of each hospital is used as its display name
+    spellings = pd.DataFrame({'code': codes, 'name': raw_names.to_numpy()[raw_codes[named]]})
+    display_names = (
+        spellings.groupby(['code', 'name'], sort=False).size()
+        .sort_values(ascending=False, kind='stable')
+        .reset_index()
+        .drop_duplicates('code')
+        .set_index('code')['name']
+    )
+    
+    return {
+        key: {
+            'name': display_names[code],
+            'rows': rows[code],
+            'count': len(rows[code]),
+            'sum': sums[code],
+            'sum_of_squares': sums_of_squares[code],
+            'min': minimums[code],
+            'max': maximums[code],
+            'level_counts': level_counts[code]
+        }
+        for code, key in enumerate(keys)
+    }
+
+def combine_partition_aggregates(partitions):
+    """Menggabungkan agregat beberapa partisi RS (rata-rata, min/max/std, jumlah per level) tanpa menyentuh barisnya"""
+    import numpy as np
+    import pandas as pd
+    
+    count = sum(partition['count'] for partition in partitions)
+    sums = np.sum([partition['sum'] for partition in partitions], axis=0)
+    sums_of_squares = np.sum([partition['sum_of_squares'] for partition in partitions], axis=0)
+    level_counts = np.sum([partition['level_counts'] for partition in partitions], axis=0)
+    
+    means = sums / count
+    # Sample standard deviation, as pandas .std() reports for the national overview
+    variances = (sums_of_squares - count * means ** 2) / (count - 1) if count > 1 else np.full(len(means), np.nan)
+    dimension_stats = pd.DataFrame(
+        [
+            np.min([partition['min'] for partition in partitions], axis=0),
+            np.max([partition['max'] for partition in partitions], axis=0),
+            np.sqrt(np.clip(variances, 0, None))
+        ],
+        index=['min', 'max', 'std'],
+        columns=DIMENSION_COLUMNS
+    )
+    level_distribution = {
+        f"Level {level['level']} - {level['name']}": int(level_counts[level['level']])
+        for level in SCORING_MODEL['levels']
+        if level_counts[level['level']] > 0
+    }
+    return dict(zip(DIMENSION_COLUMNS, means.tolist())), dimension_stats, level_distribution
+
+def build_partition_artifacts(artifacts, keys):
+    """Artefak overview untuk satu RS atau grup RS; hanya menyentuh baris partisi tersebut"""
+    import numpy as np
+    import pandas as pd
+    
+    partitions = [artifacts['hospital_partitions'][key] for key in keys]
+    rows = np.sort(np.concatenate([partition['rows'] for partition in partitions]))
+    scored = artifacts['scored'].iloc[rows].reset_index(drop=True)
+    name = ', '.join(partition['name'] for partition in partitions)
+    
+    dimension_averages, dimension_stats, level_distribution = combine_partition_aggregates(partitions)
+    avg_submission = dict(dimension_averages)
+    avg_submission.update({
+        'Nama Responden': f"RATA-RATA {name.upper()}",
+        'Submission ID': 'AVG',
+        'total_submissions': len(scored)
+    })
+    avg_scores = calculate_ai_maturity_score(avg_submission)
+    
+    spider_fig = create_spider_chart(avg_submission, "Rata-rata")
+    spider_fig.update_layout(
+        title=f"Rata-rata {name}"
+    )
+    
+    # Own fingerprint so exports and bootstrap seeds never collide with the national snapshot
+    fingerprint = hashlib.sha1(f"{artifacts['fingerprint']}:{'|'.join(keys)}".encode('utf-8')).hexdigest()[:16]
+    option_texts = [artifacts['submission_options'][row] for row in rows]
+    
+    # Facilities in scope, one row per hospital and location
+    locations = scored['Lokasi Rumah Sakit'] if 'Lokasi Rumah Sakit' in scored.columns else pd.Series('', index=scored.index)
+    locations = locations.astype(str).str.strip().replace({'': '-', 'nan': '-'})
+    facility_keys = pd.Series(
+        np.repeat(np.array(keys, dtype=object), [len(partition['rows']) for partition in partitions]),
+        index=np.concatenate([partition['rows'] for partition in partitions])
+    ).loc[rows].to_numpy()
+    facility_rollup = build_hospital_rollup(scored, pd.Series(facility_keys + '\t' + locations.to_numpy()))
+    if not facility_rollup.empty:
+        facility_rollup['Rumah Sakit'] = (
+            facility_rollup['Rumah Sakit'] + ' (' + facility_rollup['Kelompok RS'].str.split('\t').str[1] + ')'
+        )
+    
+    return {
+        'fingerprint': fingerprint,
+        'model_version': artifacts['model_version'],
+        'name': name,
+        'scored': scored,
+        'avg_submission': avg_submission,
+        'dimension_averages': dimension_averages,
+        'dimension_stats': dimension_stats,
+        'avg_scores': avg_scores,
+        'avg_maturity': get_ai_maturity_level(avg_scores['weighted_total']),
+        'level_distribution': level_distribution,
+        'spider_fig': spider_fig,
+        'submission_options': option_texts,
+        'submission_mapping': {option: artifacts['submission_mapping'][option] for option in option_texts},
+        'score_distribution': calculate_score_distribution(scored),
+        'bootstrap_intervals': calculate_bootstrap_intervals(scored, fingerprint),
+        'hospital_rollup': facility_rollup
+    }
+
+def get_partition_artifacts(artifacts, scope_keys):
+    """Artefak RS/grup RS dari cache snapshot, dihitung saat pertama kali dibuka; None jika belum ada submission"""
+    keys = tuple(sorted(key for key in scope_keys if key in artifacts['hospital_partitions']))
+    if not keys:
+        return None
+    
+    # Concurrent first requests may both build it; the results are identical
+    partition_artifacts = artifacts['partition_artifacts'].get(keys)
+    if partition_artifacts is None:
+        partition_artifacts = build_partition_artifacts(artifacts, keys)
+        artifacts['partition_artifacts'][keys] = partition_artifacts
+    return partition_artifacts
+
+def get_scope_secret(name, default=None):
+    """Membaca secret untuk tautan dashboard RS; `default` jika secrets tidak ada"""
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+def sign_scope(org, secret):
+    """Tanda tangan HMAC-SHA256 (hex) untuk nilai parameter `org` pada tautan dashboard RS"""
+    return hmac.new(secret.encode('utf-8'), org.encode('utf-8'), hashlib.sha256).hexdigest()
+
+def verify_scope(org, signature, secret):
+    """Memeriksa tanda tangan tautan dashboard RS; False jika kunci belum diatur"""
+    if not secret or not org or not signature:
+        return False
+    return hmac.compare_digest(sign_scope(org, secret), signature)
+
+def scope_partition_keys(org, groups=None):
+    """Kunci partisi (nama kanonik persis) yang boleh dilihat `org`: daftar RS sebuah grup di SCOPE_GROUPS atau satu nama RS"""
+    groups = groups or {}
+    names = groups.get(org, [org])
+    return frozenset(key for key in (canonicalize_hospital_name(name) for name in names) if key)
+
+def build_snapshot_artifacts(snapshot, previous=None):
+    """Menghitung semua artefak turunan snapshot: skor, agregat, distribusi level, grafik dan index pilihan"""
+    import numpy as np
+    
+    df = snapshot['data']
+    row_hashes = snapshot['row_hashes']
+    
+    # Rows whose content hash matches the previous snapshot keep their derived values
+    if previous is not None and previous['model_version'] == SCORING_MODEL['version']:
+        unchanged = previous['row_hashes'].reindex(row_hashes.index).to_numpy() == row_hashes.to_numpy()
+        previous_scored = previous['scored']
+    else:
+        unchanged = np.zeros(len(df), dtype=bool)
+        previous_scored = None
+    scored = update_scored_frame(df, unchanged, previous_scored)
     
     avg_submission, dimension_averages = calculate_all_submissions_average(df)
     avg_scores = calculate_ai_maturity_score(avg_submission)
+    avg_maturity = get_ai_maturity_level(avg_scores['weighted_total'])
+    
+    counts = np.bincount(scored['Level'].to_numpy(), minlength=len(LEVEL_THRESHOLDS) + 1)
+    level_distribution = {
+        f"Level {level['level']} - {level['name']}": int(counts[level['level']])
+        for level in SCORING_MODEL['levels']
+        if counts[level['level']] > 0
+    }
+    
+    spider_fig = create_spider_chart(avg_submission, "Rata-rata")
+    spider_fig.update_layout(
+        title="Rata-rata Semua Submission"
+    )
+    
+    # Dropdown options "<nama responden> (ID: <id>)" built column-wise
+    submission_ids = scored['Submission ID'].astype(str)
+    responder_names = scored['Nama Responden'].astype(str) if 'Nama Responden' in scored.columns else submission_ids
+    option_texts = (responder_names + ' (ID: ' + submission_ids + ')').tolist()
+    
+    # Clusters can merge when new spellings arrive, so they are re-resolved per snapshot;
+    # only names not yet in the process-wide n-gram index are matched
+    hospital_clusters = resolve_hospitals(scored)
+    hospital_rollup = build_hospital_rollup(scored, hospital_clusters)
+    
+    return {
+        'fingerprint': snapshot['fingerprint'],
+        'model_version': SCORING_MODEL['version'],
+        'row_hashes': row_hashes,
+        'changed_ids': row_hashes.index[~unchanged],
+        'scored': scored,
+        'avg_submission': avg_submission,
+        'dimension_averages': dimension_averages,
+        'dimension_stats': df[DIMENSION_COLUMNS].agg(['min', 'max', 'std']),
+        'avg_scores': avg_scores,
+        'avg_maturity': avg_maturity,
+        'level_distribution': level_distribution,
+        'spider_fig': spider_fig,
+        'submission_options': option_texts,
+        'submission_mapping': dict(zip(option_texts, submission_ids.tolist())),
+        'neighbour_index': build_neighbour_index(scored),
+        'score_distribution': calculate_score_distribution(scored),
+        'bootstrap_intervals': calculate_bootstrap_intervals(scored, snapshot['fingerprint']),
+        'hospital_clusters': hospital_clusters,
+        'hospital_rollup': hospital_rollup,
+        'hospital_partitions': build_hospital_partitions(scored),
+        'partition_artifacts': {}
+    }
+
+@st.cache_resource
+def get_artifact_cache():
+    """Artefak turunan per sidik jari snapshot dan versi model skor, dibagi antar sesi"""
+    return {'lock': threading.Lock(), 'latest': None, 'entries': {}}
+
+def get_latest_artifacts():
+    """Artefak snapshot terakhir yang sudah dihitung di proses ini, tanpa memuat sheet; None jika belum ada"""
+    cache = get_artifact_cache()
+    return cache['entries'].get(cache['latest'])
+
+def get_snapshot_artifacts(snapshot):
+    """Mengambil artefak snapshot dari cache; hanya dihitung ulang jika sidik jari berubah"""
+    cache = get_artifact_cache()
+    key = (snapshot['fingerprint'], SCORING_MODEL['version'])
+    
+    # The lock makes concurrent sessions wait for one build instead of each recomputing
+    with cache['lock']:
+        artifacts = cache['entries'].get(key)
+        if artifacts is None:
+            previous = cache['entries'].get(cache['latest'])
+            artifacts = build_snapshot_artifacts(snapshot, previous)
+            ingest_snapshot(
+                snapshot['data'], artifacts['row_hashes'], artifacts['changed_ids'],
+                snapshot['fingerprint'], snapshot['loaded_at']
+            )
+            
+            cache['entries'][key] = artifacts
+            while len(cache['entries']) > ARTIFACT_CACHE_ENTRIES:
+                cache['entries'].pop(next(iter(cache['entries'])))
+        cache['latest'] = key
+    
+    return artifacts
+
+def write_export_file(frame, path, file_format):
+    """Menulis frame ke file per chunk, tanpa membuat salinan terformat seluruh frame di memori"""
+    chunks = (frame.iloc[start:start + EXPORT_CHUNK_ROWS] for start in range(0, len(frame), EXPORT_CHUNK_ROWS))
+    
+    if file_format == 'csv':
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            frame.head(0).to_csv(f, index=False)
+            for chunk in chunks:
+                chunk.to_csv(f, header=False, index=False)
+    
+    elif file_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    
+    elif file_format == 'xlsx':
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Hasil Skor')
+        worksheet.append(list(frame.columns))
+        for chunk in chunks:
+            for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+                worksheet.append(row)
+        workbook.save(path)
+    
+    else:
+        raise Exception(f"Format export tidak dikenal: {file_format}")
+
+def export_scored_frame(fingerprint, scored, file_format, levels=None):
+    """Membuat (atau memakai ulang) file export untuk sidik jari snapshot, format dan segmen level"""
+    segment = 'semua' if not levels else 'level-' + '-'.join(str(level) for level in sorted(levels))
+    path = EXPORT_DIR / f"hasil-skor-{fingerprint}-{SCORING_MODEL['version']}-{segment}.{file_format}"
+    if path.exists():
+        # Marks the file as recently used for prune_exports()
+        os.utime(path)
+        return path
+    
+    frame = scored if not levels else scored[scored['Level'].isin(levels)]
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Write under a temporary name and rename, so concurrent sessions never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=EXPORT_DIR, suffix=f'.{file_format}.tmp')
+    os.close(fd)
+    try:
+        write_export_file(frame, tmp_path, file_format)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    prune_exports(keep=path)
+    return path
+
+def prune_exports(keep=None, max_files=EXPORT_MAX_FILES):
+    """Menghapus file export yang paling lama tidak dipakai sehingga tersisa paling banyak `max_files`"""
+    files = []
+    for path in EXPORT_DIR.glob('hasil-skor-*'):
+        try:
+            files.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+    
+    # Sessions that already opened a pruned file keep reading it through their handle
+    for _, path in files[max_files:]:
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+def display_export_panel(artifacts):
+    """Panel unduh hasil skor semua submission atau segmen level tertentu"""
+    export_formats = {
+        'CSV': ('csv', 'text/csv'),
+        'Parquet': ('parquet', 'application/octet-stream'),
+        'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    }
+    
+    with st.expander("📥 Export Hasil Skor"):
+        col1, col2 = st.columns(2)
+        with col1:
+            format_label = st.selectbox("Format file:", options=list(export_formats), key="export_format")
+        with col2:
+            level_options = {f"Level {level['level']} - {level['name']}": level['level'] for level in SCORING_MODEL['levels']}
+            selected_levels = st.multiselect(
+                "Filter level (kosong = semua submission):",
+                options=list(level_options),
+                key="export_levels"
+            )
+        
+        if not st.button("Siapkan File Export", key="export_prepare"):
+            return
+        
+        file_format, mime = export_formats[format_label]
+        levels = [level_options[label] for label in selected_levels]
+        
+        try:
+            with st.spinner("Menyiapkan file export..."):
+                path = export_scored_frame(artifacts['fingerprint'], artifacts['scored'], file_format, levels)
+        except ImportError:
+            st.warning(f"Export {format_label} membutuhkan paket tambahan (lihat requirements.txt)")
+            return
+        
+        with open(path, 'rb') as f:
+            st.download_button(
+                f"⬇️ Unduh {format_label}",
+                data=f,
+                file_name=path.name,
+                mime=mime,
+                key="export_download"
+            )
+
+def display_all_submissions_overview(df, artifacts=None):
+    """Menampilkan overview semua submission dengan rata-rata"""
+    
+    # Aggregates, figure and level counts are memoized per snapshot fingerprint
+    if artifacts is None:
+        artifacts = build_snapshot_artifacts(make_snapshot(df))
+    avg_submission = artifacts['avg_submission']
+    dimension_averages = artifacts['dimension_averages']
+    avg_scores = artifacts['avg_scores']
+    intervals = artifacts.get('bootstrap_intervals')
     
     st.markdown("---")
     st.markdown('<div class="submission-header">Overview Semua Submission</div>', unsafe_allow_html=True)
@@ -620,10 +2089,12 @@ def display_all_submissions_overview(df):
             value=f"{avg_scores['weighted_total']:.2f}/15",
             help="Rata-rata skor dari semua dimensi"
         )
+        if intervals is not None:
+            st.caption(format_interval(intervals['weighted_total']))
     
     with col3:
         # Calculate average AI maturity level
-        avg_maturity = get_ai_maturity_level(avg_scores['weighted_total'])
+        avg_maturity = artifacts['avg_maturity']
         st.metric(
             label="Level Rata-rata",
             value=f"Level {avg_maturity['level']}",
@@ -642,19 +2113,17 @@ def display_all_submissions_overview(df):
     st.markdown("### Analisis Dimensi Rata-rata")
     
     # Create spider chart for averages on top
-    spider_fig = create_spider_chart(avg_submission, "Rata-rata")
-    spider_fig.update_layout(
-        title="Rata-rata Semua Submission"
-    )
+    spider_fig = artifacts['spider_fig']
     st.plotly_chart(spider_fig, use_container_width=True)
+    mark_cold_start('first_chart')
     
     # Dimension scores below
     st.markdown("#### Skor Rata-rata per Dimensi")
-    for dim in ['Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']:
+    for dim_index, dim in enumerate(['Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']):
         avg_value = dimension_averages[dim]
-        min_value = df[dim].min()
-        max_value = df[dim].max()
-        std_value = df[dim].std()
+        min_value = artifacts['dimension_stats'].loc['min', dim]
+        max_value = artifacts['dimension_stats'].loc['max', dim]
+        std_value = artifacts['dimension_stats'].loc['std', dim]
         
         # Create a progress bar visualization
         progress = avg_value / 15
@@ -669,6 +2138,8 @@ def display_all_submissions_overview(df):
                 help=f"Rata-rata: {avg_value:.1f} | Min: {min_value} | Max: {max_value} | Std: {std_value:.1f}"
             )
             st.progress(progress)
+            if intervals is not None:
+                st.caption(format_interval(intervals['dimensions'][dim_index], '{:.1f}'))
         
         # with stats_col:
         #     st.write(f"**Range:** {min_value} - {max_value}")
@@ -704,13 +2175,7 @@ def display_all_submissions_overview(df):
     # Distribution of submissions by level
     st.markdown("### Jumlah Submission per Level")
     
-    # Calculate level for each submission
-    level_distribution = {}
-    for idx, row in df.iterrows():
-        scores = calculate_ai_maturity_score(row)
-        maturity = get_ai_maturity_level(scores['weighted_total'])
-        level_name = f"Level {maturity['level']} - {maturity['name']}"
-        level_distribution[level_name] = level_distribution.get(level_name, 0) + 1
+    level_distribution = artifacts['level_distribution']
     
     # Display distribution
     dist_cols = st.columns(5)
@@ -722,19 +2187,372 @@ def display_all_submissions_overview(df):
                 value=f"{count}",
                 # delta=f"{percentage:.1f}%"
             )
+            if intervals is not None:
+                share_interval = intervals['level_shares'][int(level_name.split()[1]) - 1] * 100
+                st.caption(f"{percentage:.1f}% ({format_interval(share_interval, '{:.1f}%')})")
+    
+    display_comparison_chart(artifacts)
+    display_hospital_rollup(artifacts)
     
     return avg_submission, avg_scores, avg_maturity
 
 def get_submission_id_from_url():
     """Mengambil submission ID dari parameter URL"""
     try:
-        # For Streamlit 1.28.1, use experimental method
-        query_params = st.experimental_get_query_params()
-        submission_id = query_params.get('submission_id', [None])[0]
-        return submission_id
-    except Exception as e:
+        return st.query_params.get('submission_id')
+    except Exception:
         return None
 
+def get_view_mode_from_url():
+    """Mengambil mode tampilan (misal 'wallboard') dari parameter URL"""
+    try:
+        return st.query_params.get('mode')
+    except Exception:
+        return None
+
+def get_scope_from_url():
+    """Mengambil nama organisasi dan tanda tangan tautan dashboard RS dari parameter URL"""
+    try:
+        return st.query_params.get('org'), st.query_params.get('sig')
+    except Exception:
+        return None, None
+
+def load_wallboard_snapshot():
+    """Snapshot untuk wallboard yang tidak lebih tua dari WALLBOARD_REFRESH_SECONDS; None jika gagal"""
+    snapshot = load_snapshot()
+    
+    # Replicas reading a precompute bundle pick up new versions on their own; otherwise the
+    # shared snapshot is used while fresh enough and the wallboard cache takes over after that
+    if (
+        snapshot is not None
+        and get_bundle_dir() is None
+        and time.time() - snapshot['loaded_at'] > WALLBOARD_REFRESH_SECONDS
+    ):
+        try:
+            snapshot = fetch_wallboard_data(get_sheet_id())
+        except Exception:
+            logger.exception("Snapshot wallboard gagal dimuat, memakai snapshot bersama")
+    return snapshot
+
+def render_wallboard_tick(scope_keys=None):
+    """Satu tick wallboard: membaca snapshot dan artefak dari cache lalu menampilkan ringkasan (opsional dibatasi ke partisi RS)"""
+    wait_for_warm_up()
+    snapshot = load_wallboard_snapshot()
+    
+    if snapshot is None or snapshot['data'].empty:
+        return
+    
+    # Only cached artefacts are read here, so a tick costs the same regardless of dataset size;
+    # rows whose hash did not change are never re-scored when a new snapshot arrives
+    artifacts = get_snapshot_artifacts(snapshot)
+    if scope_keys is not None:
+        artifacts = get_partition_artifacts(artifacts, scope_keys)
+        if artifacts is None:
+            st.info("**Belum ada submission untuk tautan ini**")
+            return
+        st.markdown(f"### 🏥 {artifacts['name']}")
+    total = len(artifacts['scored'])
+    weighted_total = artifacts['avg_scores']['weighted_total']
+    avg_maturity = artifacts['avg_maturity']
+    level_counts = {
+        f"Level {level['level']} - {level['name']}": artifacts['level_distribution'].get(f"Level {level['level']} - {level['name']}", 0)
+        for level in SCORING_MODEL['levels']
+    }
+    
+    # Deltas against what this wallboard showed before the last data change
+    previous = st.session_state.get('wallboard_previous')
+    if previous is None or previous['fingerprint'] != artifacts['fingerprint']:
+        st.session_state['wallboard_baseline'] = previous
+        st.session_state['wallboard_previous'] = {
+            'fingerprint': artifacts['fingerprint'],
+            'total': total,
+            'weighted_total': weighted_total,
+            'level_counts': level_counts
+        }
+    baseline = st.session_state.get('wallboard_baseline')
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(
+            label="Total Submission",
+            value=total,
+            delta=f"{total - baseline['total']:+d}" if baseline and total != baseline['total'] else None
+        )
+    with col2:
+        st.metric(
+            label="Rata-rata Skor",
+            value=f"{weighted_total:.2f}/15",
+            delta=f"{weighted_total - baseline['weighted_total']:+.2f}" if baseline else None
+        )
+    with col3:
+        st.metric(
+            label="Level Rata-rata",
+            value=f"Level {avg_maturity['level']}",
+            help=f"{avg_maturity['name']} - {avg_maturity['description']}"
+        )
+    with col4:
+        st.metric(
+            label="Persentase Skor Rata-rata",
+            value=f"{(weighted_total / MAX_DIMENSION_SCORE) * 100:.1f}%"
+        )
+    
+    chart_col, level_col = st.columns([2, 1])
+    with chart_col:
+        st.plotly_chart(artifacts['spider_fig'], use_container_width=True)
+    with level_col:
+        st.markdown("### Jumlah Submission per Level")
+        for level_name, count in level_counts.items():
+            previous_count = baseline['level_counts'].get(level_name, 0) if baseline else count
+            st.metric(
+                label=level_name,
+                value=count,
+                delta=f"{count - previous_count:+d}" if count != previous_count else None
+            )
+    
+    st.caption(
+        f"Diperbarui otomatis setiap {WALLBOARD_REFRESH_SECONDS} detik · "
+        f"data per {time.strftime('%H:%M:%S', time.localtime(snapshot['loaded_at']))} · "
+        f"snapshot {artifacts['fingerprint'][:8]}"
+    )
+
+def display_wallboard(scope_keys=None):
+    """Mode wallboard (?mode=wallboard): ringkasan overview yang diperbarui otomatis tanpa reload halaman"""
+    st.markdown('<div class="main-header">Hasil Survei AI Maturity Assesment Rumah Sakit</div>', unsafe_allow_html=True)
+    mark_cold_start('ttfb')
+    
+    # Only this fragment reruns on the interval; the page itself is not reloaded
+    st.fragment(run_every=WALLBOARD_REFRESH_SECONDS)(render_wallboard_tick)(scope_keys)
+
+# Kolom yang disalin ke record per submission untuk halaman individual
+RECORD_FIELDS = [
+    'Nama Responden',
+    'Jabatan',
+    'Nama Rumah Sakit',
+    'Lokasi Rumah Sakit',
+    'Jumlah Tempat Tidur',
+    'Dimensi 1',
+    'Dimensi 2',
+    'Dimensi 3',
+    'Dimensi 4',
+    'Dimensi 5'
+]
+
+@st.cache_resource
+def get_record_store():
+    """Record per submission yang sudah dihitung, dibagi antar sesi (kunci: Submission ID)
+    
+    Hanya diubah di bawah lock get_artifact_cache(), karena ingest_snapshot() mengiterasinya.
+    """
+    return {}
+
+def build_submission_record(submission_data):
+    """Membuat record siap tampil: field identitas, skor dan level AI maturity"""
+    record = dict(submission_data)
+    record['scores'] = calculate_ai_maturity_score(record)
+    record['maturity_level'] = get_ai_maturity_level(record['scores']['weighted_total'])
+    return record
+
+def ingest_snapshot(df, row_hashes=None, changed_ids=None, fingerprint=None, loaded_at=None):
+    """Mengisi record store dari snapshot data; hanya submission baru/berubah yang dihitung ulang (dipanggil di bawah lock cache artefak)"""
+    store = get_record_store()
+    if loaded_at is None:
+        loaded_at = time.time()
+    if row_hashes is None:
+        row_hashes = compute_row_hashes(df)
+    submission_ids = row_hashes.index
+    
+    # Records of submissions that are no longer in the sheet are dropped
+    for sub_id in set(store).difference(submission_ids):
+        del store[sub_id]
+    
+    if changed_ids is None:
+        changed_ids = submission_ids
+    stale = submission_ids.isin(changed_ids) | ~submission_ids.isin(list(store))
+    rows = df.loc[stale].reindex(columns=RECORD_FIELDS).to_dict('records')
+    
+    for sub_id, row_hash, row in zip(submission_ids[stale], row_hashes[stale], rows):
+        row['Submission ID'] = sub_id
+        record = build_submission_record(row)
+        record['row_hash'] = int(row_hash)
+        store[sub_id] = record
+    
+    # Unchanged records are carried over to the new snapshot
+    for record in store.values():
+        record['fingerprint'] = fingerprint
+        record['loaded_at'] = loaded_at
+    
+    return store
+
+def record_from_artifacts(artifacts, submission_id, loaded_at=None):
+    """Membuat record satu submission dari scored frame artefak dan menyimpannya di record store"""
+    scored = artifacts['scored']
+    rows = scored.loc[scored['Submission ID'] == submission_id]
+    if rows.empty:
+        return None
+    
+    row = rows.iloc[0].reindex(RECORD_FIELDS).to_dict()
+    row['Submission ID'] = submission_id
+    record = build_submission_record(row)
+    record['row_hash'] = int(artifacts['row_hashes'].loc[submission_id])
+    record['fingerprint'] = artifacts['fingerprint']
+    record['loaded_at'] = time.time() if loaded_at is None else loaded_at
+    with get_artifact_cache()['lock']:
+        get_record_store()[submission_id] = record
+    return record
+
+def lookup_snapshot_record(snapshot, submission_id):
+    """Record satu submission menurut snapshot tertentu; None jika submission tidak ada di snapshot tersebut"""
+    if snapshot['data'].empty:
+        return None
+    
+    # A new snapshot re-ingests changed rows and drops deleted or quarantined submissions
+    artifacts = get_snapshot_artifacts(snapshot)
+    store = get_record_store()
+    record = store.get(submission_id)
+    if record is not None and record['fingerprint'] == artifacts['fingerprint']:
+        record['loaded_at'] = max(record['loaded_at'], snapshot['loaded_at'])
+        return record
+    
+    # Snapshots installed from a precomputed bundle fill the record store lazily
+    with get_artifact_cache()['lock']:
+        store.pop(submission_id, None)
+    return record_from_artifacts(artifacts, submission_id, snapshot['loaded_at'])
+
+def get_submission_record(submission_id):
+    """Mengambil record satu submission; sheet hanya dimuat jika record belum ada atau lebih tua dari SNAPSHOT_TTL_SECONDS"""
+    record = get_record_store().get(submission_id)
+    if record is not None and time.time() - record['loaded_at'] <= SNAPSHOT_TTL_SECONDS:
+        return record
+    
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+    record = lookup_snapshot_record(snapshot, submission_id)
+    
+    # The shared snapshot can be up to SNAPSHOT_TTL_SECONDS old; re-read the sheet before reporting
+    # not-found. Replicas reading a precompute bundle already see its newest version
+    if (
+        record is None
+        and get_bundle_dir() is None
+        and time.time() - snapshot['loaded_at'] > RECORD_MISS_REFRESH_SECONDS
+    ):
+        try:
+            record = lookup_snapshot_record(fetch_recent_data(get_sheet_id()), submission_id)
+        except Exception:
+            logger.exception("Snapshot terbaru gagal dimuat untuk Submission ID %s", submission_id)
+    return record
+
+def run_warm_up():
+    """Warm-up di background: import Plotly, prefetch sheet dan isi cache snapshot/record"""
+    metrics = get_cold_start_metrics()
+    
+    started = time.perf_counter()
+    import pandas  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    metrics['warm_up_imports'] = (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    try:
+        snapshot = read_snapshot()
+        if not snapshot['data'].empty:
+            get_snapshot_artifacts(snapshot)
+    except Exception:
+        # The first render falls back to loading the data itself
+        logger.exception("Warm-up gagal memuat data")
+    metrics['warm_up_prefetch'] = (time.perf_counter() - started) * 1000
+    logger.info(
+        "cold start warm_up_imports=%.0fms warm_up_prefetch=%.0fms",
+        metrics['warm_up_imports'], metrics['warm_up_prefetch']
+    )
+
+def wait_for_warm_up():
+    """Menunggu warm-up (maks. WARM_UP_WAIT_SECONDS) agar sheet tidak diunduh dua kali saat prefetch masih berjalan"""
+    start_warm_up().join(timeout=WARM_UP_WAIT_SECONDS)
+
+@st.cache_resource
+def start_warm_up():
+    """Menjalankan run_warm_up() sekali per proses server di thread background"""
+    thread = threading.Thread(target=run_warm_up, name="dashboard-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def display_similar_submissions(record, artifacts):
+    """Menampilkan profil RS lain (anonim) dengan skor dimensi paling mirip"""
+    import numpy as np
+    
+    st.markdown("---")
+    st.markdown('<div class="submission-header">🏥 RS dengan Profil Serupa</div>', unsafe_allow_html=True)
+    
+    k = st.slider("Jumlah profil serupa:", min_value=3, max_value=10, value=5, key="similar_k")
+    neighbour_index = artifacts['neighbour_index']
+    similar = find_similar_submissions(
+        neighbour_index,
+        [record[dim] for dim in DIMENSION_COLUMNS],
+        k=k,
+        exclude_id=record['Submission ID']
+    )
+    if not similar:
+        st.info("Belum ada submission lain untuk dibandingkan")
+        return
+    
+    # Identity fields are left out on purpose: peers are shown anonymised
+    level_names = {level['level']: level['name'] for level in SCORING_MODEL['levels']}
+    max_distance = np.sqrt(len(DIMENSION_COLUMNS))
+    header = ['Profil', 'Kemiripan', 'Level'] + [dim_detail[dim] for dim in DIMENSION_COLUMNS]
+    rows = []
+    for rank, (pos, distance) in enumerate(similar, start=1):
+        level = int(neighbour_index['levels'][pos])
+        cells = [
+            f"RS #{rank}",
+            f"{(1 - distance / max_distance) * 100:.1f}%",
+            f"Level {level} - {level_names.get(level, 'Invalid')}"
+        ] + [str(int(round(float(value) * MAX_DIMENSION_SCORE))) for value in neighbour_index['matrix'][pos]]
+        rows.append("| " + " | ".join(cells) + " |")
+    
+    # Plain markdown table, so this page does not need pandas
+    st.markdown("\n".join([
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header)
+    ] + rows))
+
+def display_individual_submission(record):
+    """Menampilkan halaman hasil individual dari satu record"""
+    # Display submission details
+    display_submission_details(record)
+    
+    # Create and display spider chart
+    st.markdown("---")
+    st.markdown('<div class="submission-header">Analisis Dimensi</div>', unsafe_allow_html=True)
+    
+    # Spider chart on top
+    spider_fig = create_spider_chart(record, record['Submission ID'])
+    st.plotly_chart(spider_fig, use_container_width=True)
+    mark_cold_start('first_chart')
+    
+    metric_col, stats_col = st.columns([1, 1])
+    
+    with metric_col:
+    # Dimension scores below
+        st.markdown("### Skor per Dimensi")
+        for dim in ['Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']:
+            value = record[dim]
+            # Create a simple progress bar visualization
+            progress = value / 15
+            st.metric(
+                label=dim.upper() + f": {dim_detail[dim]}",
+                value=f"{value}/15",
+                help=f"Skor: {value}"
+            )
+            st.progress(progress)
+    
+    # AI Maturity Analysis
+    display_ai_maturity_analysis(record, record['scores'], record['maturity_level'])
+    
+    # Peers from the snapshot already in memory; skipped if none has been loaded yet
+    artifacts = get_latest_artifacts()
+    if artifacts is not None:
+        display_similar_submissions(record, artifacts)
+
 def display_empty_data_state():
     """Menampilkan halaman ketika data masih kosong"""
     st.markdown('<div class="submission-header">📊 Dashboard Belum Memiliki Data</div>', unsafe_allow_html=True)
@@ -835,120 +2653,67 @@ def display_empty_data_state():
     
     with col2:
         if st.button("🔄 Refresh Data", use_container_width=True):
+            fetch_data.clear()
             st.rerun()
 
 def main():
-    # Load data
-    df = load_data()
-    if df is None or df.empty:
-        # Display empty state instead of error
-        display_empty_data_state()
-        return
+    # The warm-up runs in the background; only paths that need the data wait for it
+    start_warm_up()
     
-    # Main header
-    st.markdown('<div class="main-header">Hasil Survei AI Maturity Assesment Rumah Sakit</div>', unsafe_allow_html=True)
+    wallboard = get_view_mode_from_url() == 'wallboard'
+    if not wallboard:
+        # Main header is sent before any data is loaded
+        st.markdown('<div class="main-header">Hasil Survei AI Maturity Assesment Rumah Sakit</div>', unsafe_allow_html=True)
+        mark_cold_start('ttfb')
     
     # Check if submission_id is provided in URL
     submission_id_from_url = get_submission_id_from_url()
     
-    # Get list of submission IDs
-    submission_ids = df['Submission ID'].astype(str).tolist()
+    # Signed links limit every view, the wallboard included, to one hospital or group. With a signing
+    # key configured the national overview and the wallboard also need a signed link (org=*); only
+    # respondents' own ?submission_id= links outside wallboard mode stay open
+    scope, signature = get_scope_from_url()
+    secret = get_scope_secret(SCOPE_SIGNING_SECRET)
+    scope_keys = None
+    if scope is not None or signature is not None:
+        if not verify_scope(scope, signature, secret):
+            st.error("❌ Tautan dashboard rumah sakit tidak valid!")
+            return
+        if scope != NATIONAL_SCOPE:
+            scope_keys = scope_partition_keys(scope, get_scope_secret(SCOPE_GROUPS_SECRET, {}))
+    elif secret and (wallboard or not submission_id_from_url):
+        st.error("🔒 Dashboard ini hanya dapat dibuka lewat tautan bertanda tangan")
+        return
+    
+    if wallboard:
+        display_wallboard(scope_keys)
+        return
     
-    # If no query params, show only all submissions overview
-    if not submission_id_from_url:
-        # Display all submissions overview only
-        avg_submission, avg_scores, avg_maturity = display_all_submissions_overview(df)
-        
-        # # Add link to access individual submissions
-        # st.markdown("---")
-        # st.markdown("### 🔗 Akses Hasil Individual")
-        # st.info("💡 Untuk melihat hasil individual, gunakan URL: `?submission_id=<ID>` di akhir URL ini")
-        
-        # # Show available submission IDs
-        # with st.expander("� Daftar Submission ID yang tersedia"):
-        #     for i, sub_id in enumerate(submission_ids):
-        #         col1, col2 = st.columns([1, 3])
-        #         with col1:
-        #             st.code(sub_id)
-        #         with col2:
-        #             # Get responder name for this submission
-        #             responder_name = df[df['Submission ID'].astype(str) == sub_id]['Nama Responden'].iloc[0]
-        #             st.write(f"**{responder_name}**")
-        
-        # Add dropdown to access individual submissions
-        st.markdown("---")
-        st.markdown("### 🔗 Akses Hasil Individual")
-        
-        # Create options for dropdown with submission ID and responder name
-        submission_options = ["Pilih submission individual"]
-        submission_mapping = {}
-        
-        for sub_id in submission_ids:
-            responder_name = df[df['Submission ID'].astype(str) == sub_id]['Nama Responden'].iloc[0]
-            option_text = f"{responder_name} (ID: {sub_id})"
-            submission_options.append(option_text)
-            submission_mapping[option_text] = sub_id
+    # Deep links render from the record store; the full sheet is only loaded on a miss
+    if submission_id_from_url:
+        if submission_id_from_url not in get_record_store():
+            wait_for_warm_up()
+        record = get_submission_record(submission_id_from_url)
+        if record is None and get_latest_artifacts() is None:
+            # Display empty state instead of error
+            display_empty_data_state()
+            return
         
-        # Dropdown selection
-        selected_option = st.selectbox(
-            "Pilih submission yang ingin dilihat:",
-            options=submission_options,
-            key="submission_selector"
-        )
+        # A scoped link cannot open submissions of other hospitals
+        if record is not None and scope_keys is not None:
+            if canonicalize_hospital_name(record.get('Nama Rumah Sakit', '')) not in scope_keys:
+                record = None
         
-        # Navigate to selected submission
-        if selected_option != "Pilih submission individual":
-            selected_submission_id = submission_mapping[selected_option]
-            query_params = st.experimental_get_query_params()
-            query_params['submission_id'] = selected_submission_id
-            st.experimental_set_query_params(**query_params)
-            st.rerun()
-    
-    # If query params exist, show only individual submission
-    else:
         # Validate submission ID
-        if submission_id_from_url not in submission_ids:
+        if record is None:
             st.error(f"❌ Submission ID '{submission_id_from_url}' tidak ditemukan!")
             st.markdown("### Refresh untuk mencoba lagi")
-            # for sub_id in submission_ids:
-            #     st.code(sub_id)
             return
         
-        # Get the selected submission data
-        submission_data = df[df['Submission ID'].astype(str) == submission_id_from_url].iloc[0]
-        
         # Add back to overview link
         # st.markdown("### 🏠 [← Kembali ke Overview Semua Submission](?)")
         
-        # Display submission details
-        display_submission_details(submission_data)
-        
-        # Create and display spider chart
-        st.markdown("---")
-        st.markdown('<div class="submission-header">Analisis Dimensi</div>', unsafe_allow_html=True)
-        
-        # Spider chart on top
-        spider_fig = create_spider_chart(submission_data, submission_id_from_url)
-        st.plotly_chart(spider_fig, use_container_width=True)
-        
-        metric_col, stats_col = st.columns([1, 1])
-        
-        with metric_col:
-        # Dimension scores below
-            st.markdown("### Skor per Dimensi")
-            for dim in ['Dimensi 1', 'Dimensi 2', 'Dimensi 3', 'Dimensi 4', 'Dimensi 5']:
-                value = submission_data[dim]
-                # Create a simple progress bar visualization
-                progress = value / 15
-                st.metric(
-                    label=dim.upper() + f": {dim_detail[dim]}",
-                    value=f"{value}/15",
-                    help=f"Skor: {value}"
-                )
-                st.progress(progress)
-        
-        # AI Maturity Analysis
-        display_ai_maturity_analysis(submission_data)
+        display_individual_submission(record)
         
         # Raw data section (expandable)
         # with st.expander("🔍 Lihat Data Survey Lengkap"):
@@ -956,6 +2721,68 @@ def main():
         #     display_columns = [col for col in df.columns if not col.startswith('Dimensi') and col != 'Submission ID']
         #     display_data = submission_data[display_columns].to_frame().T
         #     st.dataframe(display_data, use_container_width=True)
+        return
+    
+    # Load data
+    wait_for_warm_up()
+    snapshot = load_snapshot()
+    if snapshot is None or snapshot['data'].empty:
+        # Display empty state instead of error
+        display_empty_data_state()
+        return
+    df = snapshot['data']
+    
+    # Derived values are reused while the snapshot fingerprint is unchanged;
+    # a new snapshot also refreshes the per-submission records used by deep links
+    artifacts = get_snapshot_artifacts(snapshot)
+    
+    # Scoped view: everything below reads the hospital's own partition instead of the national data
+    if scope_keys is not None:
+        artifacts = get_partition_artifacts(artifacts, scope_keys)
+        if artifacts is None:
+            st.info(f"**Belum ada submission dari {scope}**")
+            return
+        df = artifacts['scored']
+        st.markdown(f"### 🏥 {artifacts['name']}")
+    
+    # No query params: show only all submissions overview
+    # Display all submissions overview only
+    avg_submission, avg_scores, avg_maturity = display_all_submissions_overview(df, artifacts)
+    display_what_if_panel(df)
+    display_export_panel(artifacts)
+    
+    # Rows held back or flagged by validate_snapshot()
+    quarantine = snapshot['quarantine']
+    if scope_keys is None and not quarantine.empty:
+        n_rejected = int((quarantine['Status'] == 'Dikarantina').sum())
+        with st.expander(f"⚠️ Data Bermasalah ({n_rejected} dikarantina, {len(quarantine) - n_rejected} peringatan)"):
+            st.dataframe(quarantine, use_container_width=True, hide_index=True)
+    
+    # # Add link to access individual submissions
+    # st.markdown("---")
+    # st.markdown("### 🔗 Akses Hasil Individual")
+    # st.info("💡 Untuk melihat hasil individual, gunakan URL: `?submission_id=<ID>` di akhir URL ini")
+    
+    # Add dropdown to access individual submissions
+    st.markdown("---")
+    st.markdown("### 🔗 Akses Hasil Individual")
+    
+    # Options for dropdown with submission ID and responder name (selector index from artifacts)
+    submission_options = ["Pilih submission individual"] + artifacts['submission_options']
+    submission_mapping = artifacts['submission_mapping']
+    
+    # Dropdown selection
+    selected_option = st.selectbox(
+        "Pilih submission yang ingin dilihat:",
+        options=submission_options,
+        key="submission_selector"
+    )
+    
+    # Navigate to selected submission
+    if selected_option != "Pilih submission individual":
+        selected_submission_id = submission_mapping[selected_option]
+        st.query_params['submission_id'] = selected_submission_id
+        st.rerun()
 
 if __name__ == "__main__":
     main()
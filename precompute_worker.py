@@ -0,0 +1,61 @@
+"""Worker precompute: mengambil sheet sekali dan menulis bundle bersama untuk semua replika dashboard.
+
+Jalankan di host yang sama dengan replika (atau dengan storage bersama):
+
+    python precompute_worker.py --bundle-dir /srv/jotform-result/bundles --interval 60
+
+Replika dashboard membaca bundle ini jika PRECOMPUTE_BUNDLE_DIR di-set (env atau secrets),
+sehingga sheet hanya diunduh dan diproses sekali, bukan sekali per replika.
+"""
+import argparse
+import time
+
+import app
+
+def run_once(bundle_dir, previous=None):
+    """Mengambil snapshot terbaru dan menulis bundle baru jika isinya berubah"""
+    # Bypass the in-process snapshot cache so every tick sees the latest sheet
+    app.fetch_data.clear()
+    snapshot = app.fetch_data(app.get_sheet_id())
+    if snapshot['data'].empty:
+        print("[precompute] Data masih kosong, bundle tidak ditulis", flush=True)
+        return previous
+    
+    current_version = app.read_current_bundle_version(bundle_dir)
+    if (
+        previous is not None
+        and current_version is not None
+        and previous['fingerprint'] == snapshot['fingerprint']
+        and previous['model_version'] == app.SCORING_MODEL['version']
+    ):
+        print(f"[precompute] Tidak ada perubahan ({current_version})", flush=True)
+        return previous
+    
+    started = time.perf_counter()
+    artifacts = app.build_snapshot_artifacts(snapshot, previous)
+    version = app.write_bundle(bundle_dir, snapshot, artifacts)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"[precompute] Bundle {version} ditulis: {len(artifacts['scored'])} submission, "
+        f"{len(artifacts['changed_ids'])} baris berubah, {elapsed_ms:.0f}ms",
+        flush=True
+    )
+    return artifacts
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute bundle hasil survey untuk replika dashboard")
+    parser.add_argument('--bundle-dir', required=True, help="Folder bundle bersama (sama dengan PRECOMPUTE_BUNDLE_DIR replika)")
+    parser.add_argument('--interval', type=float, default=0, help="Jeda antar refresh dalam detik (0 = sekali jalan)")
+    args = parser.parse_args()
+    
+    previous = run_once(args.bundle_dir)
+    while args.interval > 0:
+        time.sleep(args.interval)
+        try:
+            previous = run_once(args.bundle_dir, previous)
+        except Exception as e:
+            # Keep serving the last bundle; the next tick retries
+            print(f"[precompute] Gagal memperbarui bundle: {e}", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# app.py lives at the repository root and is imported as a plain module
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def make_frame():
+    """Builds a survey frame from dimension scores, with optional extra columns"""
+    import pandas as pd
+
+    import app
+
+    def make(scores, ids=None, **columns):
+        df = pd.DataFrame(scores, columns=app.DIMENSION_COLUMNS)
+        df['Submission ID'] = ids if ids is not None else [str(i) for i in range(len(df))]
+        for col, values in columns.items():
+            df[col] = values
+        return df
+    return make
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+    yield
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+
+
+@pytest.fixture
+def snapshot_of(make_frame):
+    def make(scores, ids):
+        df = make_frame(scores, ids=ids, **{'Nama Responden': [f"Responden {i}" for i in ids], 'Nama Rumah Sakit': ['RS A'] * len(ids)})
+        return app.make_snapshot(df)
+    return make
+
+
+@pytest.fixture
+def scored_rows(monkeypatch):
+    """Number of rows passed to build_scored_frame() per call"""
+    calls = []
+    build_scored_frame = app.build_scored_frame
+    def counting(df):
+        calls.append(len(df))
+        return build_scored_frame(df)
+    monkeypatch.setattr(app, 'build_scored_frame', counting)
+    return calls
+
+
+def test_only_changed_rows_are_rescored(snapshot_of, scored_rows):
+    first = app.build_snapshot_artifacts(snapshot_of([[1] * 5, [2] * 5, [3] * 5], ['a', 'b', 'c']))
+    second_snapshot = snapshot_of([[1] * 5, [12] * 5, [3] * 5, [4] * 5], ['a', 'b', 'c', 'd'])
+    second = app.build_snapshot_artifacts(second_snapshot, first)
+    
+    assert scored_rows == [3, 2]
+    assert sorted(second['changed_ids']) == ['b', 'd']
+    # Reused rows give the same frame as scoring the whole snapshot again
+    pd.testing.assert_frame_equal(second['scored'], app.build_scored_frame(second_snapshot['data']), check_dtype=False)
+
+
+def test_scoring_model_change_rescores_everything(monkeypatch, snapshot_of, scored_rows):
+    first = app.build_snapshot_artifacts(snapshot_of([[1] * 5, [2] * 5], ['a', 'b']))
+    monkeypatch.setitem(app.SCORING_MODEL, 'version', 'next')
+    second = app.build_snapshot_artifacts(snapshot_of([[1] * 5, [2] * 5], ['a', 'b']), first)
+    
+    assert scored_rows == [2, 2]
+    assert sorted(second['changed_ids']) == ['a', 'b']
+
+
+def test_row_hashes_follow_content_not_order(snapshot_of):
+    first = snapshot_of([[1] * 5, [2] * 5], ['a', 'b'])
+    reordered = snapshot_of([[2] * 5, [1] * 5], ['b', 'a'])
+    
+    assert first['row_hashes']['a'] == reordered['row_hashes']['a']
+    assert snapshot_of([[1] * 5, [3] * 5], ['a', 'b'])['row_hashes']['b'] != first['row_hashes']['b']
+
+
+def test_artifacts_are_memoized_per_fingerprint(snapshot_of, scored_rows):
+    snapshot = snapshot_of([[1] * 5, [2] * 5], ['a', 'b'])
+    artifacts = app.get_snapshot_artifacts(snapshot)
+    
+    assert app.get_snapshot_artifacts(snapshot_of([[1] * 5, [2] * 5], ['a', 'b'])) is artifacts
+    assert app.get_latest_artifacts() is artifacts
+    assert scored_rows == [2]
+    assert set(app.get_record_store()) == {'a', 'b'}
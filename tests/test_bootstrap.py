@@ -0,0 +1,32 @@
+import numpy as np
+
+import app
+
+
+def test_bootstrap_intervals_cover_means_and_are_reproducible(make_frame):
+    rng = np.random.default_rng(1)
+    scored = app.build_scored_frame(make_frame(rng.integers(0, 16, (200, 5))))
+    
+    intervals = app.calculate_bootstrap_intervals(scored, '00ff00ff00ff00ff', resamples=2000)
+    again = app.calculate_bootstrap_intervals(scored, '00ff00ff00ff00ff', resamples=2000)
+    
+    means = scored[app.DIMENSION_COLUMNS].mean().to_numpy()
+    assert np.all(intervals['dimensions'][:, 0] < means) and np.all(means < intervals['dimensions'][:, 1])
+    weighted_mean = app.score_matrix(scored[app.DIMENSION_COLUMNS].to_numpy(dtype=float), app.compile_scoring_model()[0]).mean()
+    assert intervals['weighted_total'][0] < weighted_mean < intervals['weighted_total'][1]
+    assert intervals['level_shares'].shape == (len(app.SCORING_MODEL['levels']), 2)
+    np.testing.assert_array_equal(intervals['dimensions'], again['dimensions'])
+
+
+def test_bootstrap_matches_index_resampling(make_frame):
+    scored = app.build_scored_frame(make_frame([[v] * 5 for v in [2, 5, 5, 9, 11, 12, 14, 15, 7, 3]]))
+    intervals = app.calculate_bootstrap_intervals(scored, 'abcdefabcdefabcd', resamples=20000)
+    
+    values = scored['Dimensi 1'].to_numpy()
+    indices = np.random.default_rng(0).integers(0, len(values), (20000, len(values)))
+    expected = np.percentile(values[indices].mean(axis=1), [2.5, 97.5])
+    np.testing.assert_allclose(intervals['dimensions'][0], expected, atol=0.2)
+
+
+def test_bootstrap_of_empty_frame_is_none(make_frame):
+    assert app.calculate_bootstrap_intervals(app.build_scored_frame(make_frame([])), '0' * 16) is None
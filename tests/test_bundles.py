@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+    app.read_bundle.clear()
+    yield
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+    app.read_bundle.clear()
+
+
+@pytest.fixture
+def snapshot_with_artifacts(make_frame):
+    def make(seed):
+        rng = np.random.default_rng(seed)
+        ids = [str(1000 + i) for i in range(30)]
+        df = make_frame(rng.integers(0, 16, (30, 5)), ids=ids, **{
+            'Nama Responden': [f"Responden {i}" for i in ids],
+            'Nama Rumah Sakit': rng.choice(['RS Harapan Kita', 'Rumah Sakit Harapan Kita', 'RSUD Dr. Soetomo'], 30)
+        })
+        quarantine = pd.DataFrame({'Baris Sheet': [40], 'Submission ID': [''], 'Status': ['Dikarantina'], 'Alasan': ['Submission ID kosong']})
+        snapshot = app.make_snapshot(df, quarantine)
+        return snapshot, app.build_snapshot_artifacts(snapshot)
+    return make
+
+
+def test_bundle_round_trips_snapshot_and_artifacts(tmp_path, snapshot_with_artifacts):
+    snapshot, artifacts = snapshot_with_artifacts(0)
+    version = app.write_bundle(tmp_path, snapshot, artifacts)
+    loaded_snapshot, loaded = app.read_bundle(str(tmp_path / version))
+    
+    assert loaded['fingerprint'] == artifacts['fingerprint'] == loaded_snapshot['fingerprint']
+    pd.testing.assert_frame_equal(loaded['scored'], artifacts['scored'], check_dtype=False)
+    pd.testing.assert_frame_equal(loaded_snapshot['quarantine'], snapshot['quarantine'])
+    assert loaded['submission_mapping'] == artifacts['submission_mapping']
+    assert loaded['level_distribution'] == artifacts['level_distribution']
+    assert loaded['avg_scores']['weighted_total'] == pytest.approx(artifacts['avg_scores']['weighted_total'])
+    pd.testing.assert_frame_equal(loaded['dimension_stats'], artifacts['dimension_stats'], check_dtype=False)
+    np.testing.assert_array_equal(loaded['score_distribution']['density'], artifacts['score_distribution']['density'])
+    np.testing.assert_allclose(loaded['bootstrap_intervals']['dimensions'], artifacts['bootstrap_intervals']['dimensions'])
+    np.testing.assert_array_equal(loaded['neighbour_index']['matrix'], artifacts['neighbour_index']['matrix'])
+    np.testing.assert_array_equal(loaded['row_hashes'].to_numpy(), artifacts['row_hashes'].to_numpy())
+    assert loaded['hospital_clusters'].to_dict() == artifacts['hospital_clusters'].to_dict()
+    assert set(loaded['hospital_partitions']) == set(artifacts['hospital_partitions'])
+
+
+def test_current_points_to_the_newest_complete_version(tmp_path, snapshot_with_artifacts):
+    first = app.write_bundle(tmp_path, *snapshot_with_artifacts(0))
+    assert app.read_current_bundle_version(tmp_path) == first
+    
+    second = app.write_bundle(tmp_path, *snapshot_with_artifacts(1))
+    assert app.read_current_bundle_version(tmp_path) == second
+    assert not [path for path in tmp_path.iterdir() if path.name.startswith('.')]
+    assert app.read_current_bundle_version(tmp_path / 'missing') is None
+
+
+def test_old_versions_are_pruned_and_current_is_kept(monkeypatch, tmp_path, snapshot_with_artifacts):
+    # Versions written within the same second differ only in fingerprint; write them with
+    # descending fingerprints so name order and age order disagree
+    monkeypatch.setattr(app.time, 'strftime', lambda fmt, *args: '20260101T000000')
+    bundles = sorted((snapshot_with_artifacts(seed) for seed in range(4)), key=lambda bundle: bundle[1]['fingerprint'], reverse=True)
+    versions = [app.write_bundle(tmp_path, *bundle, keep_versions=2) for bundle in bundles]
+    
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir()) == sorted(versions[-2:])
+    assert app.read_current_bundle_version(tmp_path) == versions[-1]
+
+
+def test_loading_a_bundle_installs_its_artifacts(tmp_path, snapshot_with_artifacts):
+    snapshot, artifacts = snapshot_with_artifacts(0)
+    app.write_bundle(tmp_path, snapshot, artifacts)
+    app.get_record_store()['stale'] = {}
+    
+    loaded_snapshot = app.load_bundle_snapshot(tmp_path)
+    
+    assert loaded_snapshot['fingerprint'] == artifacts['fingerprint']
+    assert app.get_snapshot_artifacts(loaded_snapshot) is app.get_latest_artifacts()
+    assert app.get_latest_artifacts()['fingerprint'] == artifacts['fingerprint']
+    assert 'stale' not in app.get_record_store()
+    assert app.load_bundle_snapshot(tmp_path / 'empty') is None
@@ -0,0 +1,29 @@
+import numpy as np
+
+import app
+
+
+def test_score_distribution_has_fixed_size_and_counts_every_submission(make_frame):
+    rng = np.random.default_rng(3)
+    scores = rng.integers(0, app.MAX_DIMENSION_SCORE + 1, (500, 5))
+    distribution = app.calculate_score_distribution(app.build_scored_frame(make_frame(scores)))
+    
+    np.testing.assert_allclose(distribution['percentiles'], np.percentile(scores, app.COMPARISON_PERCENTILES, axis=0))
+    assert distribution['density'].shape == (len(app.DIMENSION_COLUMNS), app.MAX_DIMENSION_SCORE + 1)
+    assert distribution['density'].sum(axis=1).tolist() == [500] * 5
+    np.testing.assert_array_equal(distribution['density'][0], np.bincount(scores[:, 0], minlength=app.MAX_DIMENSION_SCORE + 1))
+
+
+def test_fractional_scores_fall_in_the_nearest_bin(make_frame):
+    distribution = app.calculate_score_distribution(make_frame([[2.4] * 5, [2.6] * 5, [14.9] * 5]))
+    assert np.flatnonzero(distribution['density'][0]).tolist() == [2, 3, 15]
+
+
+def test_search_returns_a_bounded_number_of_matches():
+    options = [f"Responden {i} (ID: {1000 + i})" for i in range(100)]
+    
+    assert app.search_submission_options(options, '', limit=5) == options[:5]
+    assert app.search_submission_options(options, 'id: 1042') == ['Responden 42 (ID: 1042)']
+    assert app.search_submission_options(options, 'RESPONDEN 1', limit=3) == ['Responden 1 (ID: 1001)', 'Responden 10 (ID: 1010)', 'Responden 11 (ID: 1011)']
+    # The query is matched literally, not as a regular expression
+    assert app.search_submission_options(options, '(ID') == options[:app.COMPARISON_SEARCH_RESULTS]
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+
+@pytest.fixture
+def scored(make_frame):
+    df = make_frame(np.arange(50).reshape(10, 5) % 16, **{'Nama Responden': [f"Responden {i}" for i in range(10)]})
+    df.loc[3, 'Nama Responden'] = None
+    return app.build_scored_frame(df)
+
+
+@pytest.fixture(autouse=True)
+def export_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'EXPORT_DIR', tmp_path)
+    # Several chunks even for a small frame
+    monkeypatch.setattr(app, 'EXPORT_CHUNK_ROWS', 3)
+    return tmp_path
+
+
+@pytest.mark.parametrize('file_format, read', [
+    ('csv', lambda path: pd.read_csv(path, dtype={'Submission ID': str})),
+    ('parquet', pd.read_parquet),
+    ('xlsx', lambda path: pd.read_excel(path, dtype={'Submission ID': str})),
+])
+def test_chunked_writer_round_trips(scored, export_dir, file_format, read):
+    path = export_dir / f"out.{file_format}"
+    app.write_export_file(scored, path, file_format)
+    
+    # Missing cells come back as NaN or None depending on the format
+    pd.testing.assert_frame_equal(read(path).fillna('-'), scored.fillna('-'), check_dtype=False)
+
+
+def test_unknown_format_is_rejected(scored, export_dir):
+    with pytest.raises(Exception, match='Format export tidak dikenal'):
+        app.write_export_file(scored, export_dir / 'out.json', 'json')
+
+
+def test_export_is_reused_per_fingerprint_and_segment(scored, export_dir):
+    path = app.export_scored_frame('f' * 16, scored, 'csv', levels=[1, 2])
+    os.utime(path, (1, 1))
+    
+    assert app.export_scored_frame('f' * 16, scored, 'csv', levels=[2, 1]) == path
+    assert path.stat().st_mtime > 1
+    assert set(pd.read_csv(path)['Level']) <= {1, 2}
+    assert app.export_scored_frame('f' * 16, scored, 'csv') != path
+    assert not list(export_dir.glob('*.tmp'))
+
+
+def test_prune_keeps_the_most_recently_used_files(export_dir):
+    paths = [export_dir / f"hasil-skor-{i}.csv" for i in range(5)]
+    for i, path in enumerate(paths):
+        path.write_text('x')
+        os.utime(path, (i, i))
+    # The file just written is kept even when it is not among the newest
+    app.prune_exports(keep=paths[0], max_files=2)
+    
+    assert sorted(export_dir.iterdir()) == [paths[0], paths[3], paths[4]]
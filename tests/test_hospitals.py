@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+import pytest
+
+import app
+
+
+def cluster_keys(names):
+    index = {'parent': {}, 'grams': {}, 'signatures': {}, 'postings': defaultdict(set)}
+    canonical_names = [app.canonicalize_hospital_name(name) for name in names]
+    for canonical in canonical_names:
+        app.add_hospital_name(index, canonical)
+    return [app.find_hospital_cluster(index, canonical) for canonical in canonical_names]
+
+
+def test_canonicalize_unifies_spelling_and_keeps_specific_type():
+    assert app.canonicalize_hospital_name("Rumah Sakit Harapan Kita.") == 'harapan kita'
+    assert app.canonicalize_hospital_name("R.S. Harapan  Kita") == 'harapan kita'
+    assert app.canonicalize_hospital_name("Rumah Sakit Umum Daerah dr. Soetomo") == 'rsud dr soetomo'
+    assert app.canonicalize_hospital_name("RSIA Bunda Jakarta") == 'rsia bunda jakarta'
+
+
+def test_signature_holds_type_number_and_roman_tokens():
+    assert app.hospital_name_signature('rsud cengkareng 2') == {'rsud', '2'}
+    assert app.hospital_name_signature('bhayangkara tingkat ii jakarta') == {'ii'}
+    assert app.hospital_name_signature('harapan kita') == frozenset()
+
+
+@pytest.mark.parametrize('names', [
+    ("RS Harapan Kita", "Rumah Sakit Harapan Kita."),
+    ("RSUD Dr. Soetomo", "Rumah Sakit Umum Daerah dr Soetomo"),
+    ("RS Siloam Kebon Jeruk", "RS Siloam Kebon Jeruk."),
+    ("RS Pondok Indah Puri Indah", "RS Pondok Indah Puri Indha"),
+])
+def test_spelling_variants_merge(names):
+    first, second = cluster_keys(names)
+    assert first == second
+
+
+@pytest.mark.parametrize('names', [
+    ("RS Bhayangkara Tingkat I Jakarta", "RS Bhayangkara Tingkat II Jakarta"),
+    ("RS Hermina Jatinegara", "RS Hermina Jatinegara 2"),
+    ("RSUD Cengkareng", "RSUD Cengkareng 2"),
+    ("RSIA Bunda Jakarta", "RS Bunda Jakarta"),
+    ("RS Sehat 12 Nusantara", "RS Sehat 112 Nusantara"),
+])
+def test_distinct_facilities_stay_separate(names):
+    first, second = cluster_keys(names)
+    assert first != second
+
+
+def test_numbered_facilities_do_not_chain_through_unnumbered_name():
+    keys = cluster_keys(["RS Hermina Jatinegara 2", "RS Hermina Jatinegara", "RS Hermina Jatinegara 3"])
+    assert len(set(keys)) == 3
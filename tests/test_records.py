@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def empty_stores():
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+    yield
+    app.get_record_store.clear()
+    app.get_artifact_cache.clear()
+
+
+@pytest.fixture
+def snapshot_of(make_frame):
+    def make(scores, ids, loaded_at=None):
+        df = make_frame(scores, ids=ids, **{'Nama Responden': [f"Responden {i}" for i in ids], 'Nama Rumah Sakit': ['RS A'] * len(ids)})
+        snapshot = app.make_snapshot(df)
+        if loaded_at is not None:
+            snapshot['loaded_at'] = loaded_at
+        return snapshot
+    return make
+
+
+def use_snapshots(monkeypatch, shared, recent=None):
+    monkeypatch.setattr(app, 'load_snapshot', lambda: shared)
+    monkeypatch.setattr(app, 'get_bundle_dir', lambda: None)
+    monkeypatch.setattr(app, 'get_sheet_id', lambda: 'sheet')
+    reads = []
+    def fetch_recent_data(sheet_id):
+        reads.append(sheet_id)
+        return recent
+    monkeypatch.setattr(app, 'fetch_recent_data', fetch_recent_data)
+    return reads
+
+
+def test_ingest_snapshot_rebuilds_only_changed_and_drops_deleted(snapshot_of):
+    first = snapshot_of([[10] * 5, [5] * 5, [1] * 5], ['a', 'b', 'c'])
+    store = app.ingest_snapshot(first['data'], fingerprint=first['fingerprint'], loaded_at=1.0)
+    unchanged = store['a']
+    
+    second = snapshot_of([[10] * 5, [15] * 5], ['a', 'b'])
+    hashes = second['row_hashes']
+    changed_ids = hashes.index[hashes != first['row_hashes'].reindex(hashes.index)]
+    app.ingest_snapshot(second['data'], second['row_hashes'], changed_ids, second['fingerprint'], 2.0)
+    
+    assert set(store) == {'a', 'b'}
+    assert store['a'] is unchanged
+    assert store['b']['Dimensi 1'] == 15
+    assert store['b']['scores']['weighted_total'] == pytest.approx(15)
+    assert all(record['fingerprint'] == second['fingerprint'] and record['loaded_at'] == 2.0 for record in store.values())
+
+
+def test_stale_record_is_revalidated_against_the_snapshot(monkeypatch, snapshot_of):
+    old = snapshot_of([[10] * 5], ['a'])
+    app.ingest_snapshot(old['data'], fingerprint=old['fingerprint'], loaded_at=time.time() - app.SNAPSHOT_TTL_SECONDS - 1)
+    use_snapshots(monkeypatch, snapshot_of([[2] * 5], ['a'], loaded_at=time.time()))
+    
+    assert app.get_submission_record('a')['Dimensi 1'] == 2
+
+
+def test_fresh_record_is_served_without_loading(monkeypatch, snapshot_of):
+    snapshot = snapshot_of([[10] * 5], ['a'])
+    app.ingest_snapshot(snapshot['data'], fingerprint=snapshot['fingerprint'], loaded_at=time.time())
+    monkeypatch.setattr(app, 'load_snapshot', lambda: pytest.fail('snapshot loaded for a fresh record'))
+    
+    assert app.get_submission_record('a')['Dimensi 1'] == 10
+
+
+def test_miss_on_an_aged_snapshot_rereads_the_sheet(monkeypatch, snapshot_of):
+    shared = snapshot_of([[10] * 5], ['a'], loaded_at=time.time() - app.RECORD_MISS_REFRESH_SECONDS - 1)
+    recent = snapshot_of([[10] * 5, [7] * 5], ['a', 'new'], loaded_at=time.time())
+    reads = use_snapshots(monkeypatch, shared, recent)
+    
+    assert app.get_submission_record('new')['Dimensi 1'] == 7
+    assert app.get_submission_record('missing') is None
+    assert reads == ['sheet', 'sheet']
+
+
+def test_miss_on_a_fresh_snapshot_is_not_found_without_rereading(monkeypatch, snapshot_of):
+    reads = use_snapshots(monkeypatch, snapshot_of([[10] * 5], ['a'], loaded_at=time.time()))
+    
+    assert app.get_submission_record('missing') is None
+    assert reads == []
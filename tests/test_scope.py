@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+
+def make_snapshot(names, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = [str(i) for i in range(len(names))]
+    df = pd.DataFrame(rng.integers(1, 4, size=(len(names), len(app.DIMENSION_COLUMNS))), columns=app.DIMENSION_COLUMNS)
+    df['Submission ID'] = ids
+    df['Nama Responden'] = [f"Responden {i}" for i in ids]
+    df['Nama Rumah Sakit'] = names
+    df['Lokasi Rumah Sakit'] = ['Jakarta' if i % 2 else 'Bandung' for i in range(len(names))]
+    return {
+        'data': df,
+        'row_hashes': pd.Series(ids, index=ids),
+        'fingerprint': '0123456789abcdef'
+    }
+
+
+def test_verify_scope_accepts_only_matching_signatures():
+    signature = app.sign_scope('RS Harapan Kita', 'k')
+    assert app.verify_scope('RS Harapan Kita', signature, 'k')
+    assert not app.verify_scope('RS Harapan Kita', signature, 'other')
+    assert not app.verify_scope('RS Harapan Kita Bogor', signature, 'k')
+    assert not app.verify_scope('RS Harapan Kita', '', 'k')
+
+
+def test_verify_scope_rejects_everything_without_a_key():
+    assert not app.verify_scope('RS Harapan Kita', app.sign_scope('RS Harapan Kita', 'k'), None)
+    assert not app.verify_scope('RS Harapan Kita', app.sign_scope('RS Harapan Kita', ''), '')
+
+
+def test_scope_keys_are_exact_canonical_names():
+    assert app.scope_partition_keys('Rumah Sakit Sehat 12 Nusantara.') == {'sehat 12 nusantara'}
+    assert 'sehat 112 nusantara' not in app.scope_partition_keys('RS Sehat 12 Nusantara')
+
+
+def test_scope_groups_cover_differently_named_facilities():
+    groups = {'Grup Hermina': ['RS Hermina Bekasi', 'RS Hermina Bogor']}
+    assert app.scope_partition_keys('Grup Hermina', groups) == {'hermina bekasi', 'hermina bogor'}
+    assert app.scope_partition_keys('RS Hermina Bekasi', groups) == {'hermina bekasi'}
+
+
+def test_partition_aggregates_match_pandas():
+    names = ['RS Harapan Kita', 'Rumah Sakit Harapan Kita.', 'RSUD Dr. Soetomo', 'RS Harapan Kita', '-', 'RSUD Dr Soetomo']
+    df = make_snapshot(names)['data']
+    scored = app.update_scored_frame(df, np.zeros(len(df), dtype=bool), None)
+    partitions = app.build_hospital_partitions(scored)
+    
+    assert set(partitions) == {'harapan kita', 'rsud dr soetomo'}
+    assert partitions['harapan kita']['name'] == 'RS Harapan Kita'
+    assert partitions['harapan kita']['rows'].tolist() == [0, 1, 3]
+    
+    rows = scored.iloc[[0, 1, 3, 2, 5]]
+    averages, stats, levels = app.combine_partition_aggregates(list(partitions.values()))
+    assert averages == pytest.approx(rows[app.DIMENSION_COLUMNS].mean().to_dict())
+    pd.testing.assert_frame_equal(stats, rows[app.DIMENSION_COLUMNS].agg(['min', 'max', 'std']), check_dtype=False)
+    assert sum(levels.values()) == 5
+
+
+def test_partition_artifacts_hold_only_scoped_rows():
+    names = ['RS Hermina Bekasi', 'RS Hermina Bogor', 'RS Hermina Depok', 'RS Hermina Bekasi']
+    artifacts = app.build_snapshot_artifacts(make_snapshot(names))
+    
+    groups = {'Grup Hermina': ['RS Hermina Bekasi', 'RS Hermina Bogor']}
+    group = app.get_partition_artifacts(artifacts, app.scope_partition_keys('Grup Hermina', groups))
+    assert group['scored']['Submission ID'].tolist() == ['0', '1', '3']
+    assert set(group['submission_mapping'].values()) == {'0', '1', '3'}
+    assert group['fingerprint'] != artifacts['fingerprint']
+    # One rollup row per hospital and location: Bekasi (Bandung), Bekasi (Jakarta), Bogor (Jakarta)
+    assert len(group['hospital_rollup']) == 3
+    
+    assert app.get_partition_artifacts(artifacts, frozenset({'hermina cibubur'})) is None
+
+
+def run_dashboard(params, signing_key='k'):
+    """Runs the real main() on the bundled sample sheet with the given query params"""
+    from streamlit.testing.v1 import AppTest
+    
+    def script():
+        from pathlib import Path
+        
+        import pandas as pd
+        
+        import app
+        
+        sample = Path(app.__file__).with_name('SURVEY AI MATURITY ASSESSMENT RUMAH SAKIT - Form responses.csv')
+        app.fetch_sheet_csv = lambda sheet_id: pd.read_csv(sample, dtype={'Submission ID': str})
+        app.get_bundle_dir = lambda: None
+        app.main()
+    
+    at = AppTest.from_function(script, default_timeout=60)
+    at.secrets['GOOGLE_SHEETS_ID'] = 'sheet'
+    if signing_key:
+        at.secrets['SCOPE_SIGNING_KEY'] = signing_key
+    for key, value in params.items():
+        at.query_params[key] = value
+    return at.run()
+
+
+SIGNED_LOCK = "🔒 Dashboard ini hanya dapat dibuka lewat tautan bertanda tangan"
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'mode': 'wallboard'},
+    # A submission_id must not unlock the national wallboard
+    {'mode': 'wallboard', 'submission_id': 'anything'},
+])
+def test_unsigned_national_views_are_locked_with_a_signing_key(params):
+    at = run_dashboard(params)
+    
+    assert [error.value for error in at.error] == [SIGNED_LOCK]
+    assert not at.metric
+
+
+def test_signed_national_wallboard_and_open_deep_links():
+    wallboard = run_dashboard({'mode': 'wallboard', 'org': app.NATIONAL_SCOPE, 'sig': app.sign_scope(app.NATIONAL_SCOPE, 'k')})
+    assert not wallboard.error
+    assert wallboard.metric[0].label == 'Total Submission'
+    
+    deep_link = run_dashboard({'submission_id': '6278404858608970289'})
+    assert not deep_link.error
+    assert deep_link.metric[0].label.startswith('DIMENSI 1')
+
+
+def test_without_a_signing_key_the_dashboard_is_open():
+    at = run_dashboard({'mode': 'wallboard'}, signing_key=None)
+    
+    assert not at.error
+    assert at.metric[0].label == 'Total Submission'
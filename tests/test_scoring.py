@@ -0,0 +1,37 @@
+import numpy as np
+
+import app
+
+
+def test_bucket_levels_upper_bounds_are_inclusive():
+    _, thresholds = app.compile_scoring_model()
+    percentages = np.array([0, 35, 35.01, 54.99, 75, 90, 90.01, 100, 100.01, -1])
+    levels = app.bucket_levels(percentages / 100 * app.MAX_DIMENSION_SCORE, thresholds)
+    assert levels.tolist() == [1, 1, 2, 2, 3, 4, 5, 5, 0, 0]
+
+
+def test_boundary_totals_stay_in_the_lower_level():
+    _, thresholds = app.compile_scoring_model()
+    # 8.25/15 is exactly 55% but computes as 55.000000000000001 in floating point
+    assert app.bucket_levels(np.array([8.25]), thresholds).tolist() == [2]
+    assert app.get_ai_maturity_level(8.25)['level'] == 2
+
+
+def test_maturity_level_matches_bucket_levels():
+    _, thresholds = app.compile_scoring_model()
+    totals = np.linspace(-1, app.MAX_DIMENSION_SCORE + 1, 341)
+    levels = app.bucket_levels(totals, thresholds)
+    assert [app.get_ai_maturity_level(total)['level'] for total in totals] == levels.tolist()
+
+
+def test_level_range_labels_follow_the_thresholds():
+    _, thresholds = app.compile_scoring_model()
+    labels = [app.format_level_range(level['level']) for level in app.SCORING_MODEL['levels']]
+    assert labels == ['0-35', '>35-55', '>55-75', '>75-90', '>90-100']
+    
+    # Each label's exclusive lower bound belongs to the previous level, its upper bound to this one
+    for level_num, threshold in enumerate(app.LEVEL_THRESHOLDS, start=1):
+        upper = np.array([threshold]) / 100 * app.MAX_DIMENSION_SCORE
+        assert app.bucket_levels(upper, thresholds).tolist() == [level_num]
+        above = level_num + 1 if level_num < len(thresholds) else 0
+        assert app.bucket_levels(upper + 1e-6, thresholds).tolist() == [above]
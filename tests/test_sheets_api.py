@@ -0,0 +1,75 @@
+import gspread
+import pytest
+
+import app
+
+
+class FakeWorksheet:
+    """Worksheet that answers column ranges the way the Sheets API does: trailing empty cells are omitted"""
+
+    def __init__(self, columns):
+        self.header = list(columns)
+        self.columns = columns
+
+    def row_values(self, row):
+        return self.header
+
+    def batch_get(self, ranges, major_dimension):
+        letters = [app.column_letter(i + 1) for i in range(len(self.header))]
+        value_ranges = []
+        for cell_range in ranges:
+            values = self.columns[self.header[letters.index(cell_range.split(':')[0].rstrip('0123456789'))]]
+            while values and values[-1] == '':
+                values = values[:-1]
+            value_ranges.append([values] if values else [])
+        return value_ranges
+
+
+def use_worksheet(monkeypatch, columns):
+    worksheet = FakeWorksheet(columns)
+    client = type('Client', (), {'open_by_key': lambda self, key: type('Sheet', (), {'sheet1': worksheet})()})()
+    monkeypatch.setattr(gspread, 'service_account_from_dict', lambda info, scopes: client)
+
+
+def sheet_columns(rows):
+    # 'Timestamp' comes first so the wanted columns do not start at A
+    columns = {'Timestamp': [''] * len(rows)}
+    for i, col in enumerate(app.SHEET_API_COLUMNS):
+        columns[col] = [row[i] for row in rows]
+    return columns
+
+
+def test_column_letter():
+    assert [app.column_letter(n) for n in [1, 26, 27, 28, 52, 703]] == ['A', 'Z', 'AA', 'AB', 'AZ', 'AAA']
+
+
+def test_api_rows_are_padded_and_only_fully_empty_rows_dropped(monkeypatch):
+    full = ['a', 'dokter', 'RS A', 'Jakarta', '100', '10', '11', '12', '13', '14', '1']
+    columns = sheet_columns([
+        full,
+        ['b', 'perawat', 'RS B', 'Bandung', '50', '5', '5', '5', '5', '5', ''],
+        [''] * len(full),
+        ['c', 'direktur', 'RS C', 'Surabaya', '', '1', '2', '3', '4', '5', '4'],
+        [''] * len(full)
+    ])
+    columns['Level AI Maturity'] = ['Level 4 - Scale-Up', '', '', '', '']
+    use_worksheet(monkeypatch, columns)
+    
+    df = app.fetch_sheet_api('sheet', {})
+    
+    assert list(df.columns) == app.SHEET_API_COLUMNS + ['Level AI Maturity']
+    # Index is the sheet row - 2, as on the CSV path; the row without an ID is kept for quarantine
+    assert df.index.tolist() == [0, 1, 3]
+    assert df['Submission ID'].tolist() == ['1', '', '4']
+    assert df['Level AI Maturity'].tolist() == ['Level 4 - Scale-Up', None, None]
+    assert df['Skor Dimensi 1'].tolist() == [10, 5, 1]
+    assert df['Jumlah Tempat Tidur:'].isna().tolist() == [False, False, True]
+
+
+def test_api_requires_the_dashboard_columns(monkeypatch):
+    columns = sheet_columns([['x'] * len(app.SHEET_API_COLUMNS)])
+    del columns['Skor Dimensi 3']
+    use_worksheet(monkeypatch, columns)
+    
+    with pytest.raises(Exception, match='Skor Dimensi 3'):
+        app.fetch_sheet_api('sheet', {})
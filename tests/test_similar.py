@@ -0,0 +1,13 @@
+import pytest
+
+import app
+
+
+def test_find_similar_submissions_orders_by_distance_and_excludes_self(make_frame):
+    scored = app.build_scored_frame(make_frame([[10] * 5, [9] * 5, [0] * 5, [10, 10, 10, 10, 8]]))
+    index = app.build_neighbour_index(scored)
+    
+    similar = app.find_similar_submissions(index, [10] * 5, k=2, exclude_id='0')
+    assert [pos for pos, _ in similar] == [3, 1]
+    assert similar[0][1] == pytest.approx(2 / app.MAX_DIMENSION_SCORE)
+    assert app.find_similar_submissions(index, [10] * 5, k=10, exclude_id='0')[-1][0] == 2
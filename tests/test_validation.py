@@ -0,0 +1,18 @@
+import app
+
+
+def test_validate_snapshot_quarantines_bad_rows_and_warns_on_identity(make_frame):
+    df = make_frame(
+        [[10] * 5, [10] * 5, [10] * 5, [16, 1, 1, 1, 1], [None, 1, 1, 1, 1], [5] * 5],
+        ids=['1', '1', '', '4', '5', '6'],
+        **{'Nama Responden': ['a', 'b', 'c', 'd', 'e', None], 'Nama Rumah Sakit': ['x'] * 6}
+    )
+    clean, quarantine = app.validate_snapshot(df)
+    
+    assert clean['Submission ID'].tolist() == ['1', '6']
+    status = dict(zip(quarantine['Baris Sheet'], quarantine['Status']))
+    assert status == {3: 'Dikarantina', 4: 'Dikarantina', 5: 'Dikarantina', 6: 'Dikarantina', 7: 'Peringatan'}
+    reasons = dict(zip(quarantine['Baris Sheet'], quarantine['Alasan']))
+    assert reasons[3] == 'Submission ID duplikat'
+    assert reasons[4] == 'Submission ID kosong'
+    assert reasons[7] == 'Nama Responden kosong'
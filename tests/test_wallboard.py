@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+import app
+
+
+def use_snapshots(monkeypatch, shared, wallboard=None, bundle_dir=None):
+    monkeypatch.setattr(app, 'load_snapshot', lambda: shared)
+    monkeypatch.setattr(app, 'get_bundle_dir', lambda: bundle_dir)
+    monkeypatch.setattr(app, 'get_sheet_id', lambda: 'sheet')
+    reads = []
+    def fetch_wallboard_data(sheet_id):
+        reads.append(sheet_id)
+        if isinstance(wallboard, Exception):
+            raise wallboard
+        return wallboard
+    monkeypatch.setattr(app, 'fetch_wallboard_data', fetch_wallboard_data)
+    return reads
+
+
+def snapshot(age):
+    return {'name': f"{age}s", 'loaded_at': time.time() - age}
+
+
+def test_fresh_shared_snapshot_is_used(monkeypatch):
+    shared = snapshot(app.WALLBOARD_REFRESH_SECONDS - 5)
+    reads = use_snapshots(monkeypatch, shared, snapshot(0))
+    
+    assert app.load_wallboard_snapshot() is shared
+    assert reads == []
+
+
+def test_aged_shared_snapshot_is_replaced_by_the_wallboard_cache(monkeypatch):
+    wallboard = snapshot(0)
+    reads = use_snapshots(monkeypatch, snapshot(app.WALLBOARD_REFRESH_SECONDS + 5), wallboard)
+    
+    assert app.load_wallboard_snapshot() is wallboard
+    assert reads == ['sheet']
+
+
+def test_bundle_replicas_never_read_the_sheet(monkeypatch, tmp_path):
+    shared = snapshot(app.WALLBOARD_REFRESH_SECONDS + 5)
+    reads = use_snapshots(monkeypatch, shared, snapshot(0), bundle_dir=tmp_path)
+    
+    assert app.load_wallboard_snapshot() is shared
+    assert reads == []
+
+
+@pytest.mark.parametrize('shared', [None, snapshot(app.WALLBOARD_REFRESH_SECONDS + 5)])
+def test_without_a_fresher_snapshot_the_shared_one_is_kept(monkeypatch, shared):
+    use_snapshots(monkeypatch, shared, RuntimeError('sheet unavailable'))
+    
+    assert app.load_wallboard_snapshot() is shared